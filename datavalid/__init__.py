@@ -1,3 +1,5 @@
+__version__ = "0.3.6"
+
 from .config import Config, load_config
 
 __all__ = ["Config", "load_config"]
@@ -18,7 +18,37 @@ parser.add_argument(
 parser.add_argument(
     "--doc", help="output markdown documentation to this file", type=pathlib.Path
 )
+parser.add_argument(
+    "--chunksize", help="validate columns by streaming files in chunks of this many rows", type=int
+)
+parser.add_argument(
+    "--only-referenced-columns", help="only read columns that are declared in schemas or read by validation tasks",
+    action="store_const", const=True
+)
+parser.add_argument(
+    "--engine", help="CSV parser to use. pyarrow parses with multiple threads",
+    choices=["pandas", "pyarrow"]
+)
+parser.add_argument(
+    "--no-cache", help="ignore cached results and tables, validate all files from scratch",
+    action="store_true"
+)
+parser.add_argument(
+    "--jobs", help="validate up to this many files at once in separate processes", type=int
+)
+parser.add_argument(
+    "--task-threads", help="run up to this many validation tasks of a file at once in a thread pool", type=int
+)
+parser.add_argument(
+    "--report-all-groups", help="report all failing groups of grouped validation tasks instead of the first one",
+    action="store_const", const=True
+)
+parser.add_argument(
+    "--max-reported-rows", help="report at most this many offending rows (and groups with --report-all-groups) for each failed validation task", type=int
+)
 args = parser.parse_args()
+if args.jobs is not None and args.jobs < 1:
+    sys.exit("--jobs should be a positive integer")
 if args.dir is None:
     datadir = pathlib.Path.cwd()
 elif not args.dir.exists() or not args.dir.is_dir():
@@ -26,7 +56,13 @@ elif not args.dir.exists() or not args.dir.is_dir():
 else:
     datadir = args.dir
 try:
-    conf = load_config(datadir)
+    conf = load_config(
+        datadir, chunksize=args.chunksize,
+        only_referenced_columns=args.only_referenced_columns,
+        engine=args.engine, task_threads=args.task_threads,
+        report_all_groups=args.report_all_groups,
+        max_reported_rows=args.max_reported_rows
+    )
 except BadConfigError as e:
     print("Error parsing config file:\n  %s" %
           str(e).replace('\n', '\n  '))
@@ -35,4 +71,4 @@ if args.doc:
     with open(args.doc, 'w') as f:
         f.write(conf.to_markdown(args.doc.parent).strip()+'\n')
 else:
-    sys.exit(conf.run())
+    sys.exit(conf.run(use_cache=not args.no_cache, jobs=args.jobs))
@@ -0,0 +1,402 @@
+import hashlib
+import json
+import os
+import pathlib
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import BadConfigError
+from .utils import hash_obj
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather as pa_feather
+except ImportError:
+    pa = None
+    pa_feather = None
+
+
+def fingerprint(filepath: pathlib.Path) -> dict:
+    """Returns a fingerprint that changes whenever the file changes
+
+    Args:
+        filepath (pathlib.Path):
+            the file to fingerprint
+
+    Returns:
+        a dictionary of resolved path, size, modified time and content hash
+    """
+    st = filepath.stat()
+    h = hashlib.sha1()
+    with filepath.open('rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return {
+        'path': str(filepath.resolve()),
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha1': h.hexdigest(),
+    }
+
+
+_nan_columns_key = b'datavalid.nan_columns'
+
+
+def _nan_columns(df: pd.DataFrame) -> list[str] or None:
+    """Returns object columns whose missing values are NaN
+
+    Arrow keeps no difference between NaN and None in object columns, so
+    these are restored on load. Returns None if a column mixes both, such
+    table can't be cached exactly.
+    """
+    columns = []
+    for col in df.columns:
+        sr = df[col]
+        if sr.dtype != object:
+            continue
+        kinds = {type(v) for v in sr[sr.isna()].tolist()}
+        if kinds == {float}:
+            columns.append(col)
+        elif len(kinds) > 1 or kinds - {type(None), float}:
+            return None
+    return columns
+
+
+class TableCache(object):
+    """Keeps parsed tables on disk as Feather files
+
+    Each entry is keyed by the file fingerprint and the options used to read
+    it, so an entry is never used once the file or reader options change.
+    Entries are evicted least recently used first when the cache grows past
+    its maximum size.
+    """
+
+    def __init__(self, cache_dir: pathlib.Path, max_size: int) -> None:
+        """Creates a new instance of TableCache
+
+        Args:
+            cache_dir (pathlib.Path):
+                directory to keep cached tables in
+            max_size (int):
+                maximum total size of cached tables in bytes
+
+        Returns:
+            no value
+        """
+        self._dir = cache_dir / 'tables'
+        self._max_size = max_size
+
+    def _path(self, fp: dict, options: dict) -> pathlib.Path:
+        return self._dir / ('%s-%s.feather' % (
+            hash_obj(fp['path'])[:16],
+            hash_obj([fp, options, pd.__version__]),
+        ))
+
+    def load(self, fp: dict, options: dict) -> pd.DataFrame or None:
+        """Loads a cached table
+
+        Args:
+            fp (dict):
+                fingerprint of the data file, returned by fingerprint()
+            options (dict):
+                options the table was read with
+
+        Returns:
+            the table or None if it is not cached
+        """
+        path = self._path(fp, options)
+        if not path.exists():
+            return None
+        try:
+            table = pa_feather.read_table(path, memory_map=True)
+            df = table.to_pandas()
+        except (pa.ArrowException, OSError):
+            return None
+        # Arrow turns missing values of object columns into None
+        metadata = table.schema.metadata or dict()
+        for col in json.loads(metadata.get(_nan_columns_key, b'[]')):
+            df[col] = df[col].where(df[col].notna(), np.nan)
+        os.utime(path)
+        return df
+
+    def save(self, fp: dict, options: dict, df: pd.DataFrame) -> None:
+        """Saves a table into cache
+
+        Tables that can't be stored in Feather format exactly (e.g. columns
+        with mixed types) are silently not cached.
+
+        Args:
+            fp (dict):
+                fingerprint of the data file, returned by fingerprint()
+            options (dict):
+                options the table was read with
+            df (pd.DataFrame):
+                the table
+
+        Returns:
+            no value
+        """
+        self._dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(fp, options)
+        # older entries of the same file won't be used again
+        for old in self._dir.glob(path.name.split('-')[0]+'-*.feather'):
+            old.unlink(missing_ok=True)
+        tmp = path.with_suffix('.tmp')
+        nan_columns = _nan_columns(df)
+        if nan_columns is None:
+            return
+        try:
+            table = pa.Table.from_pandas(df)
+            metadata = dict(table.schema.metadata or dict())
+            metadata[_nan_columns_key] = json.dumps(nan_columns)
+            table = table.replace_schema_metadata(metadata)
+            pa_feather.write_feather(table, tmp)
+        except (pa.ArrowException, TypeError, ValueError):
+            if tmp.exists():
+                tmp.unlink()
+            return
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for p in self._dir.glob('*.feather'):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                # evicted by another process
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if total <= self._max_size:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+
+class ResultCache(object):
+    """Remembers which files passed validation
+
+    A pass is recorded against the file fingerprint and a hash of everything
+    the verdict depends on, so it is only reused while neither changes.
+    """
+
+    def __init__(self, cache_dir: pathlib.Path) -> None:
+        """Creates a new instance of ResultCache
+
+        Args:
+            cache_dir (pathlib.Path):
+                directory to keep results in
+
+        Returns:
+            no value
+        """
+        self._dir = cache_dir / 'results'
+
+    def _path(self, fp: dict) -> pathlib.Path:
+        return self._dir / ('%s.json' % hash_obj(fp['path']))
+
+    def passed(self, fp: dict, key: str) -> bool:
+        """Returns whether the file passed last time it was validated
+
+        Args:
+            fp (dict):
+                fingerprint of the data file, returned by fingerprint()
+            key (str):
+                hash of the schema and options the file is validated with
+
+        Returns:
+            True if a pass was recorded for this fingerprint and key
+        """
+        path = self._path(fp)
+        if not path.exists():
+            return False
+        try:
+            with path.open() as f:
+                obj = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return obj == {'fingerprint': fp, 'key': key}
+
+    def record(self, fp: dict, key: str, passed: bool) -> None:
+        """Records validation result of a file
+
+        Args:
+            fp (dict):
+                fingerprint of the data file, returned by fingerprint()
+            key (str):
+                hash of the schema and options the file is validated with
+            passed (bool):
+                whether the file passed. Failures are not kept.
+
+        Returns:
+            no value
+        """
+        path = self._path(fp)
+        if not passed:
+            if path.exists():
+                path.unlink()
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with tmp.open('w') as f:
+            json.dump({'fingerprint': fp, 'key': key}, f)
+        os.replace(tmp, path)
+
+
+class StateCache(object):
+    """Keeps validation states of append-only files
+
+    A state holds everything needed to validate rows appended to a file
+    without validating the rest of the file again.
+    """
+
+    def __init__(self, cache_dir: pathlib.Path) -> None:
+        """Creates a new instance of StateCache
+
+        Args:
+            cache_dir (pathlib.Path):
+                directory to keep states in
+
+        Returns:
+            no value
+        """
+        self._dir = cache_dir / 'states'
+
+    def _path(self, filepath: pathlib.Path) -> pathlib.Path:
+        return self._dir / ('%s.pickle' % hash_obj(str(filepath.resolve())))
+
+    def load(self, filepath: pathlib.Path, key: str) -> dict or None:
+        """Loads state of a file
+
+        Args:
+            filepath (pathlib.Path):
+                the data file
+            key (str):
+                hash of the schema and options the file is validated with
+
+        Returns:
+            the state or None if there's no state saved with this key
+        """
+        path = self._path(filepath)
+        if not path.exists():
+            return None
+        try:
+            with path.open('rb') as f:
+                obj = pickle.load(f)
+        except Exception:
+            # written by an incompatible version
+            return None
+        if type(obj) is not dict or obj.get('key') != key:
+            return None
+        return obj['state']
+
+    def save(self, filepath: pathlib.Path, key: str, state: dict or None) -> None:
+        """Saves state of a file
+
+        Args:
+            filepath (pathlib.Path):
+                the data file
+            key (str):
+                hash of the schema and options the file is validated with
+            state (dict):
+                the state. If this is None then the saved state is removed.
+
+        Returns:
+            no value
+        """
+        path = self._path(filepath)
+        if state is None:
+            if path.exists():
+                path.unlink()
+            return
+        self._dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with tmp.open('wb') as f:
+            pickle.dump({'key': key, 'state': state}, f)
+        os.replace(tmp, path)
+
+
+class Cache(object):
+    """Holds all on-disk caches of a config
+
+    Attributes:
+        tables (TableCache):
+            cache of parsed tables, None if disabled
+        results (ResultCache):
+            cache of validation results, None if disabled
+        states (StateCache):
+            validation states of files marked as `append_only`
+    """
+    tables: TableCache or None
+    results: ResultCache or None
+    states: StateCache
+
+    def __init__(
+        self,
+        datadir: pathlib.Path,
+        dir: str = '.datavalid_cache',
+        tables: bool = False,
+        max_size: int or float = 1024,
+        results: bool = False
+    ) -> None:
+        """Creates a new instance of Cache
+
+        Args:
+            datadir (pathlib.Path):
+                the root folder for all data files
+            dir (str):
+                cache directory, relative to `datadir`
+            tables (bool):
+                whether to cache parsed tables. Requires pyarrow.
+            max_size (int or float):
+                maximum size of cached tables in megabytes
+            results (bool):
+                whether to remember files that passed validation and skip
+                them until either data or schema changes
+
+        Raises:
+            BadConfigError: There's a problem with passed-in arguments
+
+        Returns:
+            no value
+        """
+        if type(dir) is not str:
+            raise BadConfigError(
+                ['dir'], 'should be a directory path relative to data dir')
+        if type(tables) is not bool:
+            raise BadConfigError(['tables'], 'should be either true or false')
+        if type(max_size) not in [int, float] or max_size <= 0:
+            raise BadConfigError(['max_size'], 'should be a positive number')
+        if type(results) is not bool:
+            raise BadConfigError(['results'], 'should be either true or false')
+        if tables and pa is None:
+            raise BadConfigError(
+                ['tables'], 'pyarrow is required to cache tables')
+        self.dir = datadir / dir
+        self.tables = TableCache(
+            self.dir, int(max_size * 1024 * 1024)
+        ) if tables else None
+        self.results = ResultCache(self.dir) if results else None
+        self.states = StateCache(self.dir)
+        self._fingerprints = dict()
+
+    def fingerprint(self, filepath: pathlib.Path) -> dict:
+        """Returns fingerprint of a file, computed once per process
+
+        Args:
+            filepath (pathlib.Path):
+                the file to fingerprint
+
+        Returns:
+            same as fingerprint()
+        """
+        st = filepath.stat()
+        key = (str(filepath), st.st_size, st.st_mtime_ns)
+        if key not in self._fingerprints:
+            self._fingerprints[key] = fingerprint(filepath)
+        return self._fingerprints[key]
@@ -1,13 +1,222 @@
 import datetime
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
 
 from .condition import Condition
 from .date import DateParser, parse_single_date
 from .exceptions import BadConfigError, BadDateError
+from .frame_cache import FrameCache
+from .keys import duplicated
 
 
-class UniqueChecker(object):
+def _group_codes(df: pd.DataFrame, group_columns: list[str]) -> pd.Series:
+    """Returns group number of each row in order of group keys, NaN for rows
+    that don't belong to any group"""
+    if len(group_columns) == 0:
+        return pd.Series(0, index=df.index, dtype='float64')
+    return df.groupby(group_columns, observed=True).ngroup()
+
+
+class CheckerState(object):
+    """Remembers rows that a checker already passed
+
+    Rows appended to a table can then be checked against the state
+    instead of checking the whole table again. This base state is for
+    checkers that look at each row on its own, so it remembers nothing.
+    """
+
+    def __init__(self, checker, filter) -> None:
+        """Creates a new instance of CheckerState
+
+        Args:
+            checker: the checker of a task
+            filter (Filter): the filter of the same task
+
+        Returns:
+            no value
+        """
+        self._checker = checker
+        self._filter = filter
+
+    def append(self, df: pd.DataFrame, check: bool = True) -> bool:
+        """Checks rows appended after all rows added so far and remembers them
+
+        Args:
+            df (pd.DataFrame):
+                the appended rows, unfiltered
+            check (bool):
+                whether to check the rows. Rows known to pass, such as a
+                whole table that just passed the task, need not be checked.
+
+        Returns:
+            False if the rows fail the check or can't be checked against
+            this state. The whole table must then be checked again.
+        """
+        if not check:
+            return True
+        return self._checker.check_groups(
+            self._filter.rows(df), self._filter.group_columns)
+
+
+class UniqueCheckerState(CheckerState):
+    """Remembers hashes of all keys a UniqueChecker has seen
+
+    A hash collision only makes a unique key look duplicated, which leads
+    to checking the whole table again, so hashes are safe to use here.
+    """
+
+    def __init__(self, checker: "UniqueChecker", filter) -> None:
+        super().__init__(checker, filter)
+        self._hashes = np.array([], dtype='uint64')
+        self._numeric = None
+
+    def append(self, df: pd.DataFrame, check: bool = True) -> bool:
+        df = self._filter.rows(df)
+        cols = self._filter.group_columns + self._checker._columns
+        if not set(cols).issubset(df.columns):
+            return False
+        numeric = [is_numeric_dtype(df[col]) for col in cols]
+        if self._numeric is not None and numeric != self._numeric:
+            # the same value hashes differently as a number and as text
+            return False
+        keys = df[cols].astype({
+            col: 'float64' for col, is_num in zip(cols, numeric) if is_num
+        })
+        hashes = pd.util.hash_pandas_object(
+            keys, index=False).to_numpy(dtype='uint64')
+        if check and (
+            np.unique(hashes).size < hashes.size
+            or np.isin(hashes, self._hashes).any()
+        ):
+            return False
+        self._hashes = np.union1d(self._hashes, hashes)
+        self._numeric = numeric
+        return True
+
+
+class DateWindowCheckerState(CheckerState):
+    """Remembers the rows that dates of appended rows can be compared with
+
+    For every group, this keeps the row with the earliest date and the rows
+    dated within 30 days of the latest date. Appended rows dated before the
+    latest date of their group can't be checked against the state.
+    """
+
+    window = datetime.timedelta(days=30)
+
+    def __init__(self, checker, filter) -> None:
+        super().__init__(checker, filter)
+        self._context = None
+
+    def append(self, df: pd.DataFrame, check: bool = True) -> bool:
+        df = self._filter.rows(df)
+        group_cols = self._filter.group_columns
+        cols = group_cols + sorted(
+            self._checker.referenced_columns().difference(group_cols))
+        if not set(cols).issubset(df.columns):
+            return False
+        n_old = 0 if self._context is None else self._context.shape[0]
+        df = pd.concat(
+            ([] if self._context is None else [self._context]) + [df[cols]],
+            ignore_index=True
+        )
+        try:
+            dates = self._checker._date_parser.parse(df).date
+        except BadDateError:
+            return False
+        if len(group_cols) > 0:
+            codes = df.groupby(group_cols, sort=False, observed=True).ngroup()
+        else:
+            codes = pd.Series(0, index=df.index, dtype='float64')
+        valid = codes.notna() & dates.notna()
+        is_new = pd.Series(np.arange(df.shape[0]) >= n_old, index=df.index)
+
+        if check:
+            old = valid & ~is_new
+            latest = dates[old].groupby(codes[old]).max()
+            new = valid & is_new
+            if (dates[new] < codes[new].map(latest)).any():
+                return False
+            for code in codes[is_new].dropna().unique():
+                if not self._checker.check(df.loc[codes == code]):
+                    return False
+
+        dates, codes = dates[valid], codes[valid]
+        by_group = dates.groupby(codes)
+        keep = (dates >= by_group.transform('max') - self.window) \
+            | (dates == by_group.transform('min'))
+        self._context = df.loc[keep[keep].index].reset_index(drop=True)
+        return True
+
+
+class BaseChecker(object):
+    """Base class for all checker classes
+
+    Checker checks that a table satisfy a condition
+
+    Attributes:
+        err_msg (str): error message, available if check() returns False
+        df (pd.DataFrame): offending rows, available if check() returns False
+    """
+
+    def referenced_columns(self) -> set[str]:
+        """Returns names of all columns this checker reads"""
+        raise NotImplementedError()
+
+    def new_state(self, filter) -> CheckerState:
+        """Returns a new state for checking appended rows"""
+        return CheckerState(self, filter)
+
+    def check(self, df: pd.DataFrame) -> bool:
+        """Returns whether table pass the check
+
+        Args:
+            df (pd.DataFrame): data to perform check on
+
+        Returns:
+            True or False depending on whether data pass the check.
+        """
+        raise NotImplementedError()
+
+    def check_groups(self, df: pd.DataFrame, group_columns: list[str], all_groups: bool = False, cache: FrameCache or None = None) -> bool:
+        """Returns whether every group of table pass the check
+
+        This calls check() on each group in order of group keys and stops
+        at the first failing group. Subclasses check all groups in one
+        vectorized operation instead where they can.
+
+        Args:
+            df (pd.DataFrame): data to perform check on
+            group_columns (list[str]): columns to group by, rows with a
+                missing group key must already be left out
+            all_groups (bool): if True then don't stop at the first failing
+                group. Offending rows of all groups are kept in `df` and
+                `err_msg` is the message of the first failing group.
+            cache (FrameCache): cache of `df`, used to share values such as
+                parsed dates with other tasks
+
+        Returns:
+            True or False depending on whether data pass the check.
+        """
+        if len(group_columns) == 0:
+            return self.check(df)
+        err_msg, rows = None, []
+        for _, sub_df in df.groupby(group_columns, observed=True):
+            if not self.check(sub_df):
+                if not all_groups:
+                    return False
+                err_msg = err_msg or self.err_msg
+                rows.append(self.df)
+        if len(rows) == 0:
+            return True
+        self.err_msg = err_msg
+        self.df = pd.concat(rows)
+        return False
+
+
+class UniqueChecker(BaseChecker):
     """Checks whether a table is unique per given columns
 
     Attributes:
@@ -36,6 +245,14 @@ class UniqueChecker(object):
                 [], 'should be a column name or a list of column names'
             )
 
+    def referenced_columns(self) -> set[str]:
+        """Returns names of all columns this checker reads"""
+        return set(self._columns)
+
+    def new_state(self, filter) -> CheckerState:
+        """Returns a new state for checking appended rows"""
+        return UniqueCheckerState(self, filter)
+
     def check(self, df: pd.DataFrame) -> bool:
         """Returns whether table pass the check
 
@@ -45,14 +262,25 @@ class UniqueChecker(object):
         Returns:
             True or False depending on whether data pass the check.
         """
-        succeed = not df.duplicated(subset=self._columns).any()
-        if not succeed:
-            self.err_msg = 'Table contains duplicates'
-            self.df = df[df.duplicated(subset=self._columns, keep=False)]
-        return succeed
-
-
-class EmptyChecker(object):
+        return self.check_groups(df, [])
+
+    def check_groups(self, df: pd.DataFrame, group_columns: list[str], all_groups: bool = False, cache: FrameCache or None = None) -> bool:
+        # unique within each group is the same as unique together with
+        # the group columns
+        dups = pd.Series(duplicated(
+            df, list(dict.fromkeys(group_columns + self._columns)), cache
+        ), index=df.index)
+        if not dups.any():
+            return True
+        if len(group_columns) > 0 and not all_groups:
+            codes = _group_codes(df, group_columns)
+            dups &= codes == codes[dups].min()
+        self.err_msg = 'Table contains duplicates'
+        self.df = df[dups]
+        return False
+
+
+class EmptyChecker(BaseChecker):
     """Checks whether a table have no row with specified condition
 
     Attributes:
@@ -71,6 +299,10 @@ class EmptyChecker(object):
         """
         self._condition = Condition(**kwargs)
 
+    def referenced_columns(self) -> set[str]:
+        """Returns names of all columns this checker reads"""
+        return self._condition.referenced_columns()
+
     def check(self, df: pd.DataFrame) -> bool:
         """Returns whether table pass the check
 
@@ -80,15 +312,20 @@ class EmptyChecker(object):
         Returns:
             True or False depending on whether data pass the check.
         """
-        succeed = not self._condition.bool_index(df).any()
+        return self.check_groups(df, [])
+
+    def check_groups(self, df: pd.DataFrame, group_columns: list[str], all_groups: bool = False, cache: FrameCache or None = None) -> bool:
+        # each row is checked on its own so groups don't matter
+        mask = self._condition.bool_index(df, cache)
+        succeed = not mask.any()
         if not succeed:
-            df = self._condition.apply(df)
+            df = df.loc[mask]
             self.err_msg = 'There are %d such rows' % df.shape[0]
             self.df = df
         return succeed
 
 
-class NoConsecutiveDateChecker(object):
+class NoConsecutiveDateChecker(BaseChecker):
     """Checks that a table contains no consecutive date
 
     Attributes:
@@ -119,6 +356,14 @@ class NoConsecutiveDateChecker(object):
         except TypeError as e:
             raise BadConfigError(['date_from'], str(e))
 
+    def referenced_columns(self) -> set[str]:
+        """Returns names of all columns this checker reads"""
+        return self._date_parser.referenced_columns()
+
+    def new_state(self, filter) -> CheckerState:
+        """Returns a new state for checking appended rows"""
+        return DateWindowCheckerState(self, filter)
+
     def check(self, df: pd.DataFrame) -> bool:
         """Returns whether table pass the check
 
@@ -128,30 +373,53 @@ class NoConsecutiveDateChecker(object):
         Returns:
             True or False depending on whether data pass the check.
         """
-        try:
-            date_series = self._date_parser.parse(df).date
-        except BadDateError as e:
-            self.err_msg = e.msg
-            self.df = e.rows
-            return False
-        prev_date = None
-        prev_ind = None
-        succeed = True
-        for ind, date in date_series.sort_values().items():
-            if prev_date is None:
-                prev_date = date
-                prev_ind = ind
-            elif prev_date == date - datetime.timedelta(days=1):
-                succeed = False
-                break
-        if not succeed:
-            df = df.loc[[prev_ind, ind]]
-            self.err_msg = 'Consecutive dates detected'
-            self.df = df
-        return succeed
+        return self.check_groups(df, [])
 
+    def check_groups(self, df: pd.DataFrame, group_columns: list[str], all_groups: bool = False, cache: FrameCache or None = None) -> bool:
+        """Checks all groups of a table in one pass
 
-class NoMoreThanOncePer30DaysChecker(object):
+        Every row dated one day before or after another row of the same
+        group is reported, across all groups.
+
+        Args:
+            df (pd.DataFrame): data to perform check on
+            group_columns (list[str]): columns to group by
+            all_groups (bool): same as in BaseChecker.check_groups(). Only
+                makes a difference when some dates are invalid.
+            cache (FrameCache): same as in BaseChecker.check_groups()
+
+        Returns:
+            True or False depending on whether all groups pass the check.
+        """
+        try:
+            dates = self._date_parser.parse(df, cache).date
+        except BadDateError as e:
+            if len(group_columns) == 0 or all_groups:
+                self.err_msg = e.msg
+                self.df = e.rows
+                return False
+            # find the group that would have been reported first
+            return super().check_groups(df, group_columns)
+
+        codes = _group_codes(df, group_columns)
+        pos = np.flatnonzero((codes.notna() & dates.notna()).to_numpy())
+        codes = codes.to_numpy()[pos].astype('int64')
+        days = dates.to_numpy()[pos].astype('datetime64[D]').astype('int64')
+        # group code and day packed into one integer so that the day before
+        # and after can be looked up across all groups at once
+        keys = (codes << 32) + (days + (1 << 31))
+        uniq = np.unique(keys)
+        bad = np.isin(keys - 1, uniq) | np.isin(keys + 1, uniq)
+        if not bad.any():
+            return True
+        pos, codes, days = pos[bad], codes[bad], days[bad]
+        rows = pos[np.lexsort((pos, days, codes))]
+        self.err_msg = 'Consecutive dates detected'
+        self.df = df.iloc[rows]
+        return False
+
+
+class NoMoreThanOncePer30DaysChecker(BaseChecker):
     """Checks that a table contains no 2 rows which is 30 days apart or less
 
     Attributes:
@@ -182,6 +450,14 @@ class NoMoreThanOncePer30DaysChecker(object):
         except TypeError as e:
             raise BadConfigError(['date_from'], str(e))
 
+    def referenced_columns(self) -> set[str]:
+        """Returns names of all columns this checker reads"""
+        return self._date_parser.referenced_columns()
+
+    def new_state(self, filter) -> CheckerState:
+        """Returns a new state for checking appended rows"""
+        return DateWindowCheckerState(self, filter)
+
     def check(self, df: pd.DataFrame) -> bool:
         """Returns whether table pass the check
 
@@ -191,34 +467,58 @@ class NoMoreThanOncePer30DaysChecker(object):
         Returns:
             True or False depending on whether data pass the check.
         """
-        df = df.copy(True)
+        return self.check_groups(df, [])
+
+    def check_groups(self, df: pd.DataFrame, group_columns: list[str], all_groups: bool = False, cache: FrameCache or None = None) -> bool:
+        """Checks all groups of a table in one pass
+
+        This returns the same result as calling check() on each group in
+        order of group keys and stopping at the first failing group.
+
+        Args:
+            df (pd.DataFrame): data to perform check on
+            group_columns (list[str]): columns to group by
+            all_groups (bool): if True then report offending rows of all
+                groups instead of only the first failing group
+            cache (FrameCache): same as in BaseChecker.check_groups()
+
+        Returns:
+            True or False depending on whether all groups pass the check.
+        """
         try:
-            df.loc[:, 'datavalid_date'] = self._date_parser.parse(df).date
+            dates = self._date_parser.parse(df, cache).date
         except BadDateError as e:
-            self.err_msg = e.msg
-            self.df = e.rows
-            return False
-        df = df.sort_values('datavalid_date')
-        prev_date = None
-        prev_idx = None
-        indices = set()
-        for idx, row in df.iterrows():
-            if prev_date is not None and prev_date + datetime.timedelta(days=30) >= row.datavalid_date:
-                indices.add(prev_idx)
-                indices.add(idx)
-            prev_date = row.datavalid_date
-            prev_idx = idx
-        if len(indices) > 0:
-            self.err_msg = '%d rows detected occur too close together' % len(
-                indices
-            )
-            self.df = df.loc[list(indices)].sort_values('datavalid_date')\
-                .drop(columns=['datavalid_date'])
-            return False
-        return True
+            if len(group_columns) == 0 or all_groups:
+                self.err_msg = e.msg
+                self.df = e.rows
+                return False
+            # find the group that would have been reported first
+            return super().check_groups(df, group_columns)
+
+        codes = _group_codes(df, group_columns)
+        pos = np.flatnonzero((codes.notna() & dates.notna()).to_numpy())
+        codes = codes.to_numpy()[pos]
+        days = dates.to_numpy()[pos]
+        order = np.lexsort((pos, days, codes))
+        pos, codes, days = pos[order], codes[order], days[order]
+
+        close = (codes[1:] == codes[:-1]) \
+            & (days[1:] - days[:-1] <= np.timedelta64(30, 'D'))
+        bad = np.zeros(pos.size, dtype=bool)
+        bad[:-1] |= close
+        bad[1:] |= close
+        if not bad.any():
+            return True
+        if all_groups:
+            rows = pos[bad]
+        else:
+            rows = pos[bad & (codes == codes[bad].min())]
+        self.err_msg = '%d rows detected occur too close together' % rows.size
+        self.df = df.iloc[rows]
+        return False
 
 
-class ValidDateChecker(object):
+class ValidDateChecker(BaseChecker):
     """Checks that dates are valid
 
     Attributes:
@@ -259,6 +559,10 @@ class ValidDateChecker(object):
             except BadConfigError as e:
                 raise BadConfigError(['min_date']+e.path, e.msg)
 
+    def referenced_columns(self) -> set[str]:
+        """Returns names of all columns this checker reads"""
+        return self._date_parser.referenced_columns()
+
     def check(self, df: pd.DataFrame) -> bool:
         """Returns whether table pass the check
 
@@ -268,8 +572,12 @@ class ValidDateChecker(object):
         Returns:
             True or False depending on whether data pass the check.
         """
+        return self.check_groups(df, [])
+
+    def check_groups(self, df: pd.DataFrame, group_columns: list[str], all_groups: bool = False, cache: FrameCache or None = None) -> bool:
+        # each row is checked on its own so groups don't matter
         try:
-            dates = self._date_parser.parse(df)
+            dates = self._date_parser.parse(df, cache)
         except BadDateError as e:
             self.err_msg = e.msg
             self.df = e.rows
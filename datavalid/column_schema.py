@@ -3,8 +3,9 @@ from typing import Type
 import pandas as pd
 
 from .exceptions import BadConfigError, ColumnValidationError
+from .frame_cache import FrameCache
 from .field_checkers import (
-    BaseFieldChecker, MatchRegexFieldChecker, TitleCaseFieldChecker, UniqueFieldChecker, NoNAFieldChecker, OptionsFieldChecker,
+    BaseFieldChecker, ColumnCache, FieldCheckerState, MatchRegexFieldChecker, TitleCaseFieldChecker, UniqueFieldChecker, NoNAFieldChecker, OptionsFieldChecker,
     IntegerFieldChecker, FloatFieldChecker, RangeFieldChecker
 )
 
@@ -83,12 +84,31 @@ class ColumnSchema(object):
             except BadConfigError as e:
                 raise BadConfigError([k]+e.path, e.msg)
 
-    def validate(self, sr: pd.Series) -> None:
+    def satisfied_by(self, stats) -> bool:
+        """Returns whether column statistics alone prove this column is valid
+
+        Args:
+            stats (ColumnStatistics):
+                statistics of the column read from file metadata, or None
+
+        Returns:
+            True if the column need not be checked
+        """
+        return stats is not None and all(
+            checker.satisfied_by(stats) for checker in self._checkers.values()
+        )
+
+    def validate(self, sr: pd.Series, stats=None, cache: FrameCache or None = None) -> None:
         """Checks whether this column's values are all valid
 
         Args:
             sr (pd.Series):
                 the series to check
+            stats (ColumnStatistics):
+                statistics of the column read from file metadata. Checkers
+                that are satisfied by these statistics are skipped.
+            cache (FrameCache):
+                cache of the table this column belongs to
 
         Raises:
             FieldValidationError: column is not valid
@@ -96,12 +116,71 @@ class ColumnSchema(object):
         Returns:
             no value
         """
+        column = ColumnCache(sr)
         for name, checker in self._checkers.items():
-            res = checker.check(sr)
+            if stats is not None and checker.satisfied_by(stats):
+                continue
+            res = checker.check(sr, cache, column)
             if res is not None:
                 raise ColumnValidationError(self._name, name, res)
         return True
 
+    def reader_dtype(self) -> str or None:
+        """Returns the dtype this column should be read as, derived from its checkers
+
+        Integer columns are read as nullable integers, float columns as floats
+        and options columns as categoricals. Columns without such checkers,
+        including columns with only a range check, have no dtype and are left
+        to type inference so that integers are still printed as integers.
+
+        Returns:
+            dtype name or None
+        """
+        if 'integer' in self._checkers:
+            return 'Int64'
+        if 'float' in self._checkers:
+            return 'float64'
+        if 'options' in self._checkers:
+            return 'category'
+        return None
+
+    def new_states(self, stats=None) -> dict[str, FieldCheckerState]:
+        """Creates empty checker states to validate this column chunk by chunk
+
+        Args:
+            stats (ColumnStatistics):
+                statistics of the column read from file metadata. Checkers
+                that are satisfied by these statistics get no state.
+
+        Returns:
+            a dictionary of checker name and corresponding state
+        """
+        return {
+            name: checker.new_state() for name, checker in self._checkers.items()
+            if stats is None or not checker.satisfied_by(stats)
+        }
+
+    def validate_states(self, states: dict[str, FieldCheckerState]) -> None:
+        """Checks whether all chunks fed to the given states are valid
+
+        Args:
+            states (dict[str, FieldCheckerState]):
+                states created with new_states() and fed with all chunks
+                of this column
+
+        Raises:
+            ColumnValidationError: column is not valid
+
+        Returns:
+            no value
+        """
+        for name in self._checkers:
+            if name not in states:
+                continue
+            res = states[name].result()
+            if res is not None:
+                raise ColumnValidationError(self._name, name, res)
+
     def to_markdown(self) -> str:
         """Render this field schema as markdown."""
         return "\n".join(filter(None, [
@@ -1,9 +1,12 @@
 import operator
-import functools
+import re
 
+import numpy as np
 import pandas as pd
 
 from .exceptions import BadConfigError
+from .frame_cache import FrameCache
+from .keys import factorize
 
 
 logical_operators = {
@@ -12,6 +15,40 @@ logical_operators = {
 }
 
 
+def _match_regex(sr: pd.Series, pattern: str) -> np.ndarray:
+    # each distinct value is only matched once
+    codes, uniques = factorize(sr)
+    regex = re.compile(pattern)
+    matched = np.array(
+        [regex.match(str(v)) is not None for v in uniques] + [False], dtype=bool)
+    # missing values get code -1 which picks the trailing False
+    return matched[codes]
+
+
+# operators are module level functions so that conditions can be pickled
+# and sent to other processes
+
+
+def _in(sr: pd.Series, values: list) -> pd.Series:
+    return sr.isin(values)
+
+
+def _not_in(sr: pd.Series, values: list) -> pd.Series:
+    return ~sr.isin(values)
+
+
+def _is_na(sr: pd.Series, _) -> pd.Series:
+    return sr.isna()
+
+
+def _not_na(sr: pd.Series, _) -> pd.Series:
+    return sr.notna()
+
+
+def _between(sr: pd.Series, bounds: list) -> pd.Series:
+    return sr.between(bounds[0], bounds[1])
+
+
 compare_opeartors = {
     'EQUAL': operator.eq,
     'NOT_EQUAL': operator.ne,
@@ -19,6 +56,32 @@ compare_opeartors = {
     'LESS_THAN': operator.lt,
     'GREATER_EQUAL': operator.ge,
     'LESS_EQUAL': operator.le,
+    'IN': _in,
+    'NOT_IN': _not_in,
+    'IS_NA': _is_na,
+    'NOT_NA': _not_na,
+    'BETWEEN': _between,
+    'MATCH_REGEX': _match_regex,
+}
+
+# operators that don't compare with a value
+unary_operators = {'IS_NA', 'NOT_NA'}
+
+# operators that compare values by their order
+ordering_operators = {
+    'GREATER_THAN', 'LESS_THAN', 'GREATER_EQUAL', 'LESS_EQUAL', 'BETWEEN'}
+
+
+# operators that row filters of columnar readers evaluate like pandas does.
+# NOT_EQUAL is left out because rows with missing values pass it in pandas
+# but not in row filters.
+pushdown_operators = {
+    'EQUAL': '=',
+    'GREATER_THAN': '>',
+    'LESS_THAN': '<',
+    'GREATER_EQUAL': '>=',
+    'LESS_EQUAL': '<=',
+    'IN': 'in',
 }
 
 
@@ -30,7 +93,7 @@ class Condition(object):
             self,
             column: str or None = None,
             op: str or None = None,
-            value: str or int or None = None,
+            value: str or int or list or None = None,
             **kwargs) -> None:
         """Creates new instance of Condition.
 
@@ -51,7 +114,15 @@ class Condition(object):
                 - less_than
                 - greater_equal
                 - less_equal
-            value (str or int): the value to compare with
+                - in: value is a list of values
+                - not_in: value is a list of values
+                - is_na: value is not needed
+                - not_na: value is not needed
+                - between: value is a list of lower and upper bound,
+                  both inclusive
+                - match_regex: value is a regex pattern that must match
+                  the beginning of the value
+            value (str or int or list): the value to compare with
             and (list[dict]):
                 list of kwargs each will be passed down to a child Condition object.
                 The child conditions will be and-ed together.
@@ -94,34 +165,123 @@ class Condition(object):
         else:
             self._column = column
             if self._column is not None:
-                if op is None:
+                if op is None or type(op) is not str \
+                        or op.upper() not in compare_opeartors:
                     raise BadConfigError(
-                        [], '"op" is not defined. Possible values are "equal", "not_equal", "greater_than", "less_than", "greater_equal", "less_equal".'
+                        [], '"op" is not defined. Possible values are %s.' % ', '.join(
+                            '"%s"' % name.lower() for name in compare_opeartors)
                     )
-                self._op = compare_opeartors[op.upper()]
-                if value is None:
+                self._op_name = op.upper()
+                self._op = compare_opeartors[self._op_name]
+                if self._op_name in unary_operators:
+                    if value is not None:
+                        raise BadConfigError(
+                            ['value'], 'should not be defined for "%s"' % op)
+                elif value is None:
                     raise BadConfigError(
                         [], '"value" is not defined.'
                     )
+                elif self._op_name in ('IN', 'NOT_IN') and type(value) is not list:
+                    raise BadConfigError(['value'], 'should be a list of values')
+                elif self._op_name == 'BETWEEN' and (
+                        type(value) is not list or len(value) != 2):
+                    raise BadConfigError(
+                        ['value'], 'should be a list of lower and upper bound')
+                elif self._op_name == 'MATCH_REGEX':
+                    try:
+                        re.compile(value)
+                    except (re.error, TypeError) as e:
+                        raise BadConfigError(
+                            ['value'], 'should be a regex pattern: %s' % e)
                 self._value = value
 
-    def bool_index(self, df: pd.DataFrame) -> pd.Series:
+    def referenced_columns(self) -> set[str]:
+        """Returns names of all columns this condition compares
+
+        Returns:
+            a set of column names
+        """
+        if self._conds is not None:
+            return set().union(*[cond.referenced_columns() for cond in self._conds])
+        elif self._column is not None:
+            return {self._column}
+        return set()
+
+    def to_filters(self) -> list[list[tuple]] or None:
+        """Converts this condition into row filters for columnar readers.
+
+        Filters are in disjunctive normal form: a list of conjunctions, each a
+        list of (column, op, value) tuples. Rows passing this condition always
+        pass the filters, though some rows passing the filters may not pass the
+        condition, so the condition must still be applied after reading.
+
+        Returns:
+            the filters or None if this condition can't narrow down rows
+        """
+        if self._conds is not None:
+            children = [cond.to_filters() for cond in self._conds]
+            if self._logic_op is logical_operators['OR']:
+                if any(child is None for child in children):
+                    return None
+                return [conj for child in children for conj in child]
+            filters = None
+            for child in children:
+                if child is None:
+                    continue
+                if filters is None:
+                    filters = child
+                else:
+                    filters = [a + b for a in filters for b in child]
+            return filters
+        elif self._column is not None and self._op_name in pushdown_operators:
+            return [[(self._column, pushdown_operators[self._op_name], self._value)]]
+        elif self._column is not None and self._op_name == 'BETWEEN':
+            return [[
+                (self._column, '>=', self._value[0]),
+                (self._column, '<=', self._value[1]),
+            ]]
+        return None
+
+    def compile(self) -> "ConditionPlan":
+        """Compiles this condition into a plan that evaluates it in one pass.
+
+        Nested `and` and `or` conditions of the same kind are flattened into
+        their parent. The plan is compiled once and reused.
+
+        Returns:
+            the plan
+        """
+        if getattr(self, '_plan', None) is None:
+            if self._conds is not None:
+                logic_op = 'AND' if self._logic_op is logical_operators['AND'] else 'OR'
+                children = []
+                for cond in self._conds:
+                    child = cond.compile()
+                    if isinstance(child, LogicPlan) and child.op == logic_op:
+                        children.extend(child.children)
+                    else:
+                        children.append(child)
+                self._plan = LogicPlan(logic_op, children)
+            elif self._column is not None:
+                self._plan = ComparePlan(
+                    self._column, self._op_name, self._value)
+            else:
+                self._plan = ConditionPlan()
+        return self._plan
+
+    def bool_index(self, df: pd.DataFrame, cache: FrameCache or None = None) -> pd.Series:
         """Creates a boolean series by applying the condition to the provided data.
 
         Args:
             df (pd.DataFrame): The data to filter on
+            cache (FrameCache): cache of `df`. If given then the result of
+                each comparison is shared with every other condition making
+                the same comparison on the same table.
 
         Returns:
             A boolean series that can be used to filter or further combined
         """
-        if self._conds is not None:
-            bool_series = [
-                cond.bool_index(df) for cond in self._conds
-            ]
-            return functools.reduce(self._logic_op, bool_series)
-        elif self._column is not None:
-            return self._op(df[self._column], self._value)
-        return pd.Series([True]*df.shape[0], index=df.index)
+        return pd.Series(self.compile().evaluate(df, cache=cache), index=df.index)
 
     def apply(self, df: pd.DataFrame) -> pd.DataFrame:
         """Filter data with the condition.
@@ -132,4 +292,120 @@ class Condition(object):
         Returns:
             The filterd data
         """
-        return df.loc[self.bool_index].reset_index(drop=True)
+        return df.loc[self.bool_index(df)].reset_index(drop=True)
+
+
+class ConditionPlan(object):
+    """Evaluates a compiled condition, this base plan passes every row
+    """
+
+    def evaluate(self, df: pd.DataFrame, rows: np.ndarray or None = None, cache: FrameCache or None = None) -> np.ndarray:
+        """Evaluates the condition
+
+        Args:
+            df (pd.DataFrame): the data to evaluate on
+            rows (np.ndarray): if given then only evaluate rows at
+                these positions
+            cache (FrameCache): cache of `df` to share comparison
+                results through
+
+        Returns:
+            a boolean array with one element for each evaluated row
+        """
+        return np.ones(df.shape[0] if rows is None else rows.size, dtype=bool)
+
+
+class ComparePlan(ConditionPlan):
+    """Compares a column with a value
+    """
+
+    def __init__(self, column: str, op_name: str, value) -> None:
+        self.column = column
+        self.op_name = op_name
+        self.value = value
+        # repr tells apart values that compare equal, such as 1 and True
+        self.key = ('mask', column, op_name, repr(value))
+
+    def evaluate(self, df: pd.DataFrame, rows: np.ndarray or None = None, cache: FrameCache or None = None) -> np.ndarray:
+        if cache is None:
+            return self._compare(df, rows)
+        if rows is not None:
+            if not cache.has(self.key):
+                # comparing a few rows is cheaper than the whole table
+                return self._compare(df, rows)
+            cache = cache.subset(rows)
+        # masks of the whole table are kept as packed bits, 1/8 the size
+        # of a boolean array
+        return cache.get(self.key, self._packed_mask, _take_bits)
+
+    def _packed_mask(self, df: pd.DataFrame) -> tuple[np.ndarray, int]:
+        return np.packbits(self._compare(df)), df.shape[0]
+
+    def _compare(self, df: pd.DataFrame, rows: np.ndarray or None = None) -> np.ndarray:
+        sr = df[self.column]
+        op = compare_opeartors[self.op_name]
+        if isinstance(sr.dtype, np.dtype) and sr.dtype.kind in 'biuf' \
+                and type(self.value) in (int, float):
+            # numpy columns are compared with a number without going
+            # through pandas, other operators never have a number as value
+            values = sr.to_numpy()
+            return op(values if rows is None else values[rows], self.value)
+        if rows is not None:
+            sr = sr.iloc[rows]
+        if self.op_name in ordering_operators and isinstance(sr.dtype, pd.CategoricalDtype):
+            # unordered categoricals, such as options columns, can only be
+            # compared for equality
+            sr = sr.astype(object)
+        result = op(sr, self.value)
+        if isinstance(result, np.ndarray):
+            return result
+        # a missing result can only ever exclude a row since conditions
+        # have no negation
+        if result.dtype != bool:
+            result = result.fillna(False)
+        return result.to_numpy(dtype=bool)
+
+
+class LogicPlan(ConditionPlan):
+    """Combines child plans with `and` or `or`
+
+    Each child after the first is only evaluated on rows whose result it can
+    still change, and evaluation stops once no row can change anymore.
+    """
+
+    # children are evaluated on the undecided rows alone when fewer than
+    # this fraction of rows is undecided
+    sparse_fraction = 0.25
+
+    def __init__(self, op: str, children: list[ConditionPlan]) -> None:
+        self.op = op
+        self.children = children
+
+    def evaluate(self, df: pd.DataFrame, rows: np.ndarray or None = None, cache: FrameCache or None = None) -> np.ndarray:
+        n = df.shape[0] if rows is None else rows.size
+        if len(self.children) == 0:
+            return np.full(n, self.op == 'AND', dtype=bool)
+        mask = self.children[0].evaluate(df, rows, cache)
+        for child in self.children[1:]:
+            # rows that are still true for `and`, still false for `or`
+            undecided = mask if self.op == 'AND' else ~mask
+            count = np.count_nonzero(undecided)
+            if count == 0:
+                break
+            if count < n * self.sparse_fraction:
+                pos = np.flatnonzero(undecided)
+                mask[pos] = child.evaluate(
+                    df, pos if rows is None else rows[pos], cache)
+            elif self.op == 'AND':
+                mask &= child.evaluate(df, rows, cache)
+            else:
+                mask |= child.evaluate(df, rows, cache)
+        return mask
+
+
+def _take_bits(packed: tuple[np.ndarray, int], positions: np.ndarray or None) -> np.ndarray:
+    """Unpacks bits at the given positions, or all bits if positions are None"""
+    bits, n = packed
+    if positions is None:
+        return np.unpackbits(bits, count=n).astype(bool)
+    return ((bits[positions >> 3] >> (7 - (positions & 7))) & 1).astype(bool)
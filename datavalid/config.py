@@ -1,8 +1,10 @@
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
 
 import pandas as pd
 import yaml
 
+from .cache import Cache
 from .schema import Schema
 from .exceptions import BadConfigError
 from .file import File
@@ -24,7 +26,15 @@ class Config(object):
             files: dict or None = None,
             schemas: dict[str, dict] or None = None,
             save_bad_rows_to: str or None = None,
-            no_spinner: bool = False) -> None:
+            no_spinner: bool = False,
+            chunksize: int or None = None,
+            only_referenced_columns: bool or None = None,
+            engine: str or None = None,
+            cache: dict or None = None,
+            task_threads: int or None = None,
+            stop_on_first_failure: bool or None = None,
+            report_all_groups: bool or None = None,
+            max_reported_rows: int or None = None) -> None:
         """Creates new instance of Config.
 
         Args:
@@ -43,6 +53,39 @@ class Config(object):
             no_spinner (bool):
                 If set to True then don't show spinner on terminal when processing.
                 This is mostly useful during unit tests.
+            chunksize (int):
+                If set then columns of all files are validated by streaming each
+                file in chunks of this many rows. Each file can override this value
+                with its own `chunksize` key.
+            only_referenced_columns (bool):
+                If set to True then only columns declared in schemas or read by
+                validation tasks are read from files. If not set then this is True
+                for Parquet and Feather files and False for CSV files. Each file can
+                override this value with its own `only_referenced_columns` key.
+            engine (str):
+                CSV parser to use for all files, either "pandas" or "pyarrow". Each
+                file can override this value with its own `engine` key.
+            cache (dict):
+                keyword arguments to create the `Cache` object that holds on-disk
+                caches shared by all files.
+            task_threads (int):
+                If greater than 1 then validation tasks of each file are run up to
+                this many at once in a thread pool. Each file can override this
+                value with its own `task_threads` key.
+            stop_on_first_failure (bool):
+                Whether to stop running validation tasks of a file after its first
+                failed task. Defaults to True. Each file can override this value
+                with its own `stop_on_first_failure` key.
+            report_all_groups (bool):
+                If set to True then validation tasks with `group_by` report all
+                failing groups and the number of offending rows in each group
+                instead of only the first failing group. Each file can override
+                this value with its own `report_all_groups` key.
+            max_reported_rows (int):
+                If set then each failed validation task reports at most this many
+                offending rows, and with `report_all_groups` lists the counts of
+                at most this many groups. Each file can override this value with
+                its own `max_reported_rows` key.
 
         Raises:
             BadConfigError: There's a problem with passed-in arguments
@@ -57,6 +100,10 @@ class Config(object):
             if type(save_bad_rows_to) is not str:
                 raise BadConfigError(
                     [], 'key "save_bad_rows_to" should be a file path relative to data dir')
+        if chunksize is not None:
+            if type(chunksize) is not int or chunksize <= 0:
+                raise BadConfigError(
+                    [], 'key "chunksize" should be a positive integer')
         if files is None:
             raise BadConfigError([], 'key "files" should appear at top level')
         if type(files) != dict:
@@ -71,6 +118,17 @@ class Config(object):
                 [],
                 '"schemas" should contain a map of schema definitions'
             )
+        if cache is None:
+            self._cache = None
+        elif type(cache) is not dict:
+            raise BadConfigError(['cache'], 'should be a dict')
+        else:
+            try:
+                self._cache = Cache(datadir, **cache)
+            except BadConfigError as e:
+                raise BadConfigError(['cache']+e.path, e.msg)
+            except TypeError as e:
+                raise BadConfigError(['cache'], str(e))
         for name, schema in schemas.items():
             try:
                 self._schemas[name] = Schema(
@@ -86,23 +144,54 @@ class Config(object):
                 )
             try:
                 schema_name = file_conf.pop('schema')
+                file_conf.setdefault('chunksize', chunksize)
+                file_conf.setdefault(
+                    'only_referenced_columns', only_referenced_columns)
+                file_conf.setdefault('engine', engine)
+                file_conf.setdefault('task_threads', task_threads)
+                file_conf.setdefault(
+                    'stop_on_first_failure', stop_on_first_failure)
+                file_conf.setdefault('report_all_groups', report_all_groups)
+                file_conf.setdefault('max_reported_rows', max_reported_rows)
                 self._files[name] = File(
                     datadir, name, schema=self._schemas[schema_name],
-                    save_bad_rows_to=save_bad_rows_to, no_spinner=no_spinner, **file_conf
+                    save_bad_rows_to=save_bad_rows_to, no_spinner=no_spinner,
+                    cache=self._cache, **file_conf
                 )
             except BadConfigError as e:
                 raise BadConfigError(['files', name]+e.path, e.msg)
 
-    def run(self) -> int:
+    def run(self, use_cache: bool = True, jobs: int or None = None) -> int:
         """Run all validation tasks and print result to terminal.
 
+        Args:
+            use_cache (bool):
+                if False then ignore cached results and tables and validate
+                every file from scratch.
+            jobs (int):
+                if greater than 1 then validate up to this many files at once
+                in separate processes. Output of each file is still printed
+                in the order files appear in config.
+
         Returns:
             The exit code for the program.
         """
         succeed = True
-        for file in self._files.values():
-            if not file.valid():
-                succeed = False
+        if jobs is not None and jobs > 1 and len(self._files) > 1:
+            with ProcessPoolExecutor(min(jobs, len(self._files))) as executor:
+                futures = [
+                    executor.submit(file.valid_captured, use_cache)
+                    for file in self._files.values()
+                ]
+                for future in futures:
+                    file_succeed, output = future.result()
+                    print(output, end='', flush=True)
+                    if not file_succeed:
+                        succeed = False
+        else:
+            for file in self._files.values():
+                if not file.valid(use_cache):
+                    succeed = False
         if not succeed:
             return 1
         print("All good!")
@@ -129,7 +218,23 @@ class Config(object):
         ])
 
 
-def load_config(datadir: str or pathlib.Path) -> Config:
+def load_config(datadir: str or pathlib.Path, **kwargs) -> Config:
+    """Loads config from datavalid.yml in the given directory
+
+    Args:
+        datadir (str or pathlib.Path):
+            directory that contains datavalid.yml
+        **kwargs:
+            values that override top-level keys of the config file.
+            None values are ignored.
+
+    Raises:
+        FileNotFoundError: datavalid.yml does not exist
+        BadConfigError: There's a problem with the config
+
+    Returns:
+        the loaded config
+    """
     if type(datadir) is str:
         datadir = pathlib.Path(datadir)
     conf_file = datadir / 'datavalid.yml'
@@ -137,4 +242,5 @@ def load_config(datadir: str or pathlib.Path) -> Config:
         raise FileNotFoundError("%s does not exist" % conf_file)
     with conf_file.open() as f:
         obj = yaml.load(f.read(), Loader=yaml.Loader)
+    obj.update({k: v for k, v in kwargs.items() if v is not None})
     return Config(datadir, **obj)
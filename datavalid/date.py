@@ -1,8 +1,10 @@
 import datetime
 
+import numpy as np
 import pandas as pd
 
 from .exceptions import BadConfigError, BadDateError
+from .frame_cache import FrameCache
 
 
 class DateParser(object):
@@ -33,11 +35,22 @@ class DateParser(object):
             raise BadConfigError([], '"day_column" should be a column name')
         self._day = day_column
 
-    def parse(self, df: pd.DataFrame) -> pd.DataFrame:
+    def referenced_columns(self) -> set[str]:
+        """Returns names of the year, month and day columns
+
+        Returns:
+            a set of column names
+        """
+        return {self._year, self._month, self._day}
+
+    def parse(self, df: pd.DataFrame, cache: FrameCache or None = None) -> pd.DataFrame:
         """Produces a date dataframe (including date, year, month, day column) from the given data.
 
         Args:
             df (pd.DataFrame): data to derive date from
+            cache (FrameCache): cache of `df`. If given then dates are parsed
+                once for the whole table and shared by all tasks reading
+                the same columns.
 
         Raises:
             BadDateError: Impossible dates detected
@@ -45,49 +58,150 @@ class DateParser(object):
         Returns:
             a date dataframe
         """
+        parsed = None
+        if cache is not None:
+            parsed = cache.get(
+                ('dates', self._year, self._month, self._day),
+                self._try_parse_all,
+                lambda value, positions: None if value is None else value.take(positions)
+            )
+        if parsed is None:
+            # rows outside of `df` may hold values that aren't integers,
+            # only the rows of `df` itself must parse
+            parsed = self._parse_all(df)
+        return parsed.result(df)
+
+    def _try_parse_all(self, df: pd.DataFrame) -> "_ParsedDates" or None:
+        try:
+            return self._parse_all(df)
+        except (ValueError, TypeError):
+            return None
+
+    def _parse_all(self, df: pd.DataFrame) -> "_ParsedDates":
         today = datetime.date.today()
-        year = df[self._year].astype('Int64')
-        month = df[self._month].astype('Int64')
-        day = df[self._day].astype('Int64')
-
-        rows = df.loc[month.notna() & ((month < 1) | (month > 12))]
-        if rows.shape[0] > 0:
-            raise BadDateError('impossible months detected', rows)
-
-        rows = df.loc[
-            (year > today.year)
-            | (
-                (year == today.year)
-                & (
-                    (month.notna() & (month > today.month))
-                    | (day.notna() & (month == today.month) & (day > today.day))
+        y, y_na = _to_int(df[self._year])
+        m, m_na = _to_int(df[self._month])
+        d, d_na = _to_int(df[self._day])
+
+        # all masks are computed in one pass over plain integer arrays, a
+        # missing component never makes a row invalid
+        valid_month = (m >= 1) & (m <= 12)
+        leap_year = (y % 400 == 0) | ((y % 4 == 0) & (y % 100 != 0))
+        month_days = _month_days[np.where(valid_month, m, 0)] \
+            + ((m == 2) & leap_year)
+        # the length of February is unknown without a year
+        known_length = ~m_na & ~d_na & valid_month & ~((m == 2) & y_na)
+        errors = [
+            ('impossible months detected', ~m_na & ~valid_month),
+            ('future dates detected', ~y_na & (
+                (y > today.year)
+                | (
+                    (y == today.year)
+                    & ~m_na
+                    & (
+                        (m > today.month)
+                        | (~d_na & (m == today.month) & (d > today.day))
+                    )
                 )
-            )
+            )),
+            ('negative days detected', ~d_na & (d < 0)),
+            ('impossible dates detected', known_length & (d > month_days)),
         ]
-        if rows.shape[0] > 0:
-            raise BadDateError('future dates detected', rows)
-
-        rows = df.loc[day < 0]
-        if rows.shape[0] > 0:
-            raise BadDateError('negative days detected', rows)
-
-        leap_year = (year % 400 == 0) | ((year % 4 == 0) & (year % 100 != 0))
-        rows = df.loc[
-            (month.isin([1, 3, 5, 7, 8, 10, 12]) & (day > 31))
-            | (month.isin([4, 6, 9, 11]) & (day > 30))
-            | ((month == 2) & (
-                (~leap_year & (day > 28))
-                | (leap_year & (day > 29))
-            ))
-        ]
-        if rows.shape[0] > 0:
-            raise BadDateError('impossible dates detected', rows)
-
-        dates = df[[self._year, self._month, self._day]]
-        dates.columns = ["year", "month", "day"]
-        dates.loc[:, 'date'] = pd.to_datetime(dates)
-        for col in ["year", "month", "day"]:
-            dates.loc[:, col] = dates[col].astype('Int64')
+
+        # days since epoch from civil date, after Howard Hinnant's
+        # days_from_civil algorithm
+        shifted = y - (m <= 2)
+        era = np.floor_divide(shifted, 400)
+        yoe = shifted - era * 400
+        doy = (153 * ((m + 9) % 12) + 2) // 5 + d - 1
+        days = era * 146097 + yoe * 365 + yoe // 4 - yoe // 100 + doy - 719468
+        complete = ~y_na & ~m_na & ~d_na
+        assembled = complete & (d >= 1) & (days >= _min_day) & (days <= _max_day)
+        date = np.where(assembled, days, 0).astype('datetime64[D]')\
+            .astype('datetime64[ns]')
+        date[~assembled] = np.datetime64('NaT')
+        return _ParsedDates(
+            pd.arrays.IntegerArray(y, y_na), pd.arrays.IntegerArray(m, m_na),
+            pd.arrays.IntegerArray(d, d_na), date, errors,
+            complete & ~assembled,
+        )
+
+
+def _to_int(sr: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Returns values of a column as int64 along with a mask of missing values
+
+    Same as casting to Int64 but much faster for numpy columns.
+    """
+    values = sr.to_numpy()
+    if values.dtype.kind in 'iu':
+        return values.astype('int64'), np.zeros(values.size, dtype=bool)
+    if values.dtype.kind == 'f':
+        na = np.isnan(values)
+        filled = np.where(na, 0, values)
+        if np.isfinite(filled).all() and np.array_equal(filled, np.trunc(filled)):
+            return filled.astype('int64'), na
+    # raises the same error for fractional values
+    arr = sr.astype('Int64').array
+    return arr.to_numpy('int64', na_value=0), arr.isna()
+
+
+# number of days in each month of a common year, indexed by month number
+_month_days = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# range of days that datetime64[ns] can hold
+_min_day = (pd.Timestamp.min.ceil('D') - pd.Timestamp(0)).days
+_max_day = (pd.Timestamp.max.floor('D') - pd.Timestamp(0)).days
+
+
+class _ParsedDates(object):
+    """Dates and date errors of every row of a table
+
+    Errors are kept as masks rather than raised, so that subsets of the
+    table only raise errors of their own rows.
+    """
+
+    def __init__(self, year, month, day, date: np.ndarray, errors: list[tuple[str, np.ndarray]], unassembled: np.ndarray) -> None:
+        self._year = year
+        self._month = month
+        self._day = day
+        self._date = date
+        self._errors = errors
+        self._unassembled = unassembled
+
+    def take(self, positions: np.ndarray or None) -> "_ParsedDates":
+        """Returns dates of rows at the given positions, or all dates if
+        positions are None"""
+        if positions is None:
+            return self
+        return _ParsedDates(
+            self._year.take(positions), self._month.take(positions),
+            self._day.take(positions), self._date[positions],
+            [(msg, mask[positions]) for msg, mask in self._errors],
+            self._unassembled[positions],
+        )
+
+    def result(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Raises the first date error or returns the date dataframe
+
+        Args:
+            df (pd.DataFrame): the rows these dates were parsed from
+
+        Raises:
+            BadDateError: Impossible dates detected
+
+        Returns:
+            a date dataframe with the same index as `df`
+        """
+        for msg, mask in self._errors:
+            if mask.any():
+                raise BadDateError(msg, df.loc[mask])
+        dates = pd.DataFrame({
+            'year': self._year, 'month': self._month, 'day': self._day,
+        }, index=df.index)
+        if self._unassembled.any():
+            # raises the same error as parsing without errors='coerce'
+            pd.to_datetime(dates[self._unassembled].astype('float64'))
+        dates['date'] = self._date
         return dates
 
 
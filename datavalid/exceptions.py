@@ -175,13 +175,17 @@ class TaskValidationError(ValueError):
             violating rows
         warn (bool):
             whether this error should fail the whole run
+        group_counts (pd.Series):
+            number of violating rows in each failing group, if all groups
+            were checked
     """
     task_name: str
     err_msg: str
     rows: pd.DataFrame
     warn: bool
+    group_counts: pd.Series or None
 
-    def __init__(self, task_name: str, err_msg: str, rows: pd.DataFrame, warn: bool = False) -> None:
+    def __init__(self, task_name: str, err_msg: str, rows: pd.DataFrame, warn: bool = False, group_counts: pd.Series or None = None) -> None:
         """Creates a new instance of TaskValidationError
 
         Args:
@@ -193,6 +197,8 @@ class TaskValidationError(ValueError):
                 violating rows
             warn (bool):
                 whether this error should fail the whole run
+            group_counts (pd.Series):
+                number of violating rows in each failing group
 
         Returns:
             no value
@@ -204,3 +210,4 @@ class TaskValidationError(ValueError):
         self.err_msg = err_msg
         self.rows = rows
         self.warn = warn
+        self.group_counts = group_counts
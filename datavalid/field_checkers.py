@@ -1,6 +1,218 @@
+import math
+from functools import cached_property
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_float_dtype, is_integer_dtype
 
 from .exceptions import BadConfigError
+from .frame_cache import FrameCache
+from .keys import duplicated, factorize
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+def _arrow_compatible(pattern: str) -> bool:
+    """Returns whether Arrow's regex engine reads the pattern like Python
+
+    Arrow rejects most syntax it doesn't support, which is then matched
+    with Python instead. These constructs are accepted by both but mean
+    different things.
+    """
+    return '{,' not in pattern and '[:' not in pattern
+
+
+class ColumnCache(object):
+    """Values derived from a column that several field checkers need
+
+    Each value is computed the first time a checker asks for it, so a
+    column checked for e.g. `integer`, `range` and `match_regex` is only
+    factorized and converted to strings once.
+
+    Attributes:
+        sr (pd.Series): the column
+    """
+
+    def __init__(self, sr: pd.Series) -> None:
+        """Creates a new instance of ColumnCache
+
+        Args:
+            sr (pd.Series): the column
+
+        Returns:
+            no value
+        """
+        self.sr = sr
+
+    @cached_property
+    def na(self) -> pd.Series:
+        """Whether each value is missing"""
+        return self.sr.isna()
+
+    @cached_property
+    def factorized(self) -> tuple[np.ndarray, pd.Series]:
+        """Code of each value and the distinct values, missing values
+        get code -1"""
+        return factorize(self.sr)
+
+    @cached_property
+    def unique_strings(self) -> pd.Series:
+        """Distinct values converted to string, in the same order as
+        `factorized`"""
+        return self.factorized[1].astype(str)
+
+    @cached_property
+    def arrow_strings(self) -> "pa.Array or None":
+        """Distinct strings as an Arrow array, in the same order as
+        `factorized`
+
+        This is None unless pyarrow is installed and every string only
+        holds printable ASCII characters and tabs, where Arrow's string
+        kernels give the same results as Python's string methods and `re`
+        module. Both regex engines disagree on e.g. which control
+        characters `\\s` matches and where `$` matches around a line break.
+        """
+        if pa is None:
+            return None
+        arr = pa.array(self.unique_strings.to_numpy(), type=pa.string())
+        if pc.all(pc.match_substring_regex(arr, r'^[\t\x20-\x7e]*$')).as_py() is False:
+            return None
+        return arr
+
+    def match(self, pattern: str) -> np.ndarray:
+        """Matches the beginning of each distinct string with a regex pattern
+
+        Args:
+            pattern (str): the regex pattern
+
+        Returns:
+            a boolean array, same as `unique_strings.str.match(pattern)`
+        """
+        arr = self.arrow_strings
+        if arr is not None and _arrow_compatible(pattern):
+            try:
+                return pc.match_substring_regex(
+                    arr, '^(?:%s)' % pattern).to_numpy(zero_copy_only=False)
+            except pa.ArrowInvalid:
+                pass
+        return self.unique_strings.str.match(pattern).to_numpy(dtype=bool)
+
+    def by_unique(self, unique_mask: pd.Series or np.ndarray) -> np.ndarray:
+        """Maps a boolean computed for each distinct value back to each row
+
+        Checkers evaluate their predicate on distinct values only, so their
+        cost depends on the number of distinct values rather than rows.
+
+        Args:
+            unique_mask (pd.Series or np.ndarray):
+                a boolean for each distinct value, in the same order as
+                `factorized`
+
+        Returns:
+            a boolean array for each row, always False for missing values
+        """
+        codes, _ = self.factorized
+        # missing values get code -1 which picks the trailing False
+        return np.append(np.asarray(unique_mask, dtype=bool), False)[codes]
+
+    @cached_property
+    def numeric(self) -> tuple[np.ndarray, np.ndarray]:
+        """Each value as a float and whether it is not a number
+
+        Values of numeric columns are taken as they are. Other values are
+        numbers if written as an unsigned decimal such as `12` or `0.5`.
+        Missing values and empty strings are NaN without being counted as
+        not a number.
+        """
+        sr = self.sr
+        if is_integer_dtype(sr.dtype) or is_float_dtype(sr.dtype):
+            return (
+                sr.to_numpy(dtype='float64', na_value=np.nan),
+                np.zeros(sr.size, dtype=bool),
+            )
+        # each distinct value is only parsed once
+        strings = self.unique_strings
+        parsed = self.match(r'^(\d*\.)?\d+$')
+        numbers = pd.to_numeric(strings.where(parsed), errors='coerce')
+        codes, _ = self.factorized
+        return (
+            np.append(numbers.to_numpy(dtype='float64'), np.nan)[codes],
+            self.by_unique(~parsed & (strings != '')),
+        )
+
+
+class FieldCheckerState(object):
+    """Accumulates offending values of a field checker over many chunks
+
+    A column can be fed to a state chunk by chunk. Once all chunks are
+    consumed, `result()` returns the same offending values that the checker
+    would have returned had it checked the whole column at once. States of
+    the same checker can also be merged together.
+    """
+
+    def __init__(self, checker: "BaseFieldChecker") -> None:
+        """Creates a new instance of FieldCheckerState
+
+        Args:
+            checker (BaseFieldChecker):
+                the checker whose offending values are accumulated
+
+        Returns:
+            no value
+        """
+        self._checker = checker
+        self._bad = None
+
+    def _add(self, bad: pd.Series) -> None:
+        if bad.size == 0:
+            return
+        if self._bad is None:
+            self._bad = bad.drop_duplicates()
+        else:
+            self._bad = pd.concat([self._bad, bad]).drop_duplicates()
+
+    def update(self, sr: pd.Series, column: ColumnCache or None = None) -> None:
+        """Checks the next chunk of the column
+
+        Args:
+            sr (pd.Series):
+                the next chunk of the column
+            column (ColumnCache):
+                values derived from `sr`, shared with states of other
+                checkers of the same column
+
+        Returns:
+            no value
+        """
+        self._add(self._checker._bad_values(column or ColumnCache(sr)))
+
+    def merge(self, other: "FieldCheckerState") -> None:
+        """Merges state of a later part of the column into this state
+
+        Args:
+            other (FieldCheckerState):
+                state of the same checker, fed with chunks that come after
+                the chunks fed to this state
+
+        Returns:
+            no value
+        """
+        if other._bad is not None:
+            self._add(other._bad)
+
+    def result(self) -> pd.Series or None:
+        """Returns offending values of all chunks so far
+
+        Returns:
+            None if there's nothing wrong, otherwise the offending values
+            in a series
+        """
+        return self._bad
 
 
 class BaseFieldChecker(object):
@@ -10,21 +222,47 @@ class BaseFieldChecker(object):
     a condition
     """
 
-    def _bad_values(self, sr: pd.Series) -> pd.Series:
+    def _bad_values(self, column: ColumnCache) -> pd.Series:
         raise NotImplementedError()
 
-    def check(self, sr: pd.Series) -> pd.Series or None:
+    def new_state(self) -> FieldCheckerState:
+        """Creates an empty state to validate a column chunk by chunk
+
+        Returns:
+            a new FieldCheckerState
+        """
+        return FieldCheckerState(self)
+
+    def satisfied_by(self, stats) -> bool:
+        """Returns whether column statistics alone prove the column is valid
+
+        Args:
+            stats (ColumnStatistics):
+                statistics of the column read from file metadata
+
+        Returns:
+            True if the column need not be checked
+        """
+        return False
+
+    def check(self, sr: pd.Series, cache: FrameCache or None = None, column: ColumnCache or None = None) -> pd.Series or None:
         """Checks whether series satisfy condition
 
         Args:
             sr (pd.Series):
                 the series to check
+            cache (FrameCache):
+                cache of the table this series belongs to, used to share
+                work with other checks of the same table
+            column (ColumnCache):
+                values derived from `sr`, shared with other checkers of
+                the same column
 
         Returns:
             None if there's nothing wrong, otherwise it will
             return the offending values in a series
         """
-        sr = self._bad_values(sr)
+        sr = self._bad_values(column or ColumnCache(sr))
         if sr.size == 0:
             return None
         return sr
@@ -34,11 +272,75 @@ class BaseFieldChecker(object):
         raise NotImplementedError()
 
 
+class UniqueFieldCheckerState(FieldCheckerState):
+    """Keeps the set of seen values to detect duplicates across chunks"""
+
+    _na_key = object()
+
+    def __init__(self, checker: "UniqueFieldChecker") -> None:
+        super().__init__(checker)
+        self._name = None
+        self._seen = dict()
+        self._dups = set()
+
+    def _key(self, v):
+        if v is None or (type(v) is float and math.isnan(v)):
+            return self._na_key
+        # each chunk infers its own dtype, so the same value may be a
+        # number in one chunk and a string in another
+        if type(v) is float and v.is_integer():
+            v = int(v)
+        return str(v)
+
+    def update(self, sr: pd.Series, column: ColumnCache or None = None) -> None:
+        if self._name is None:
+            self._name = sr.name
+        self._dups.update(
+            self._key(v) for v in sr[sr.duplicated()].tolist()
+        )
+        for v in sr.drop_duplicates().tolist():
+            k = self._key(v)
+            if k in self._seen:
+                self._dups.add(k)
+            else:
+                self._seen[k] = v
+
+    def merge(self, other: "UniqueFieldCheckerState") -> None:
+        if self._name is None:
+            self._name = other._name
+        self._dups.update(other._dups)
+        for k, v in other._seen.items():
+            if k in self._seen:
+                self._dups.add(k)
+            else:
+                self._seen[k] = v
+
+    def result(self) -> pd.Series or None:
+        if len(self._dups) == 0:
+            return None
+        return pd.Series([
+            v for k, v in self._seen.items() if k in self._dups
+        ], name=self._name)
+
+
 class UniqueFieldChecker(BaseFieldChecker):
     """Checks that column only contain unique values"""
 
-    def _bad_values(self, sr: pd.Series) -> pd.Series:
-        return sr[sr.duplicated(keep=False)]
+    def check(self, sr: pd.Series, cache: FrameCache or None = None, column: ColumnCache or None = None) -> pd.Series or None:
+        if cache is None:
+            return super().check(sr, cache, column)
+        # hashes of the column are shared with unique tasks of the table
+        sr = sr[duplicated(sr.to_frame(), [sr.name], cache)]
+        if sr.size == 0:
+            return None
+        return sr
+
+    def _bad_values(self, column: ColumnCache) -> pd.Series:
+        sr = column.sr
+        return sr[duplicated(sr.to_frame('value'), ['value'])]
+
+    def new_state(self) -> FieldCheckerState:
+        return UniqueFieldCheckerState(self)
 
     def to_markdown(self) -> str:
         return "- Unique"
@@ -47,8 +349,12 @@ class UniqueFieldChecker(BaseFieldChecker):
 class NoNAFieldChecker(BaseFieldChecker):
     """Checks that column contain no NA value"""
 
-    def _bad_values(self, sr: pd.Series) -> pd.Series:
-        return sr[sr.isna()]
+    def _bad_values(self, column: ColumnCache) -> pd.Series:
+        return column.sr[column.na]
+
+    def satisfied_by(self, stats) -> bool:
+        # NaN is NA to pandas but is not counted as null in file metadata
+        return stats.null_count == 0 and stats.kind != 'float'
 
     def to_markdown(self) -> str:
         return "- No NA"
@@ -72,8 +378,17 @@ class OptionsFieldChecker(BaseFieldChecker):
             raise BadConfigError([], 'must be a list of strings')
         self._opts = set(options)
 
-    def _bad_values(self, sr: pd.Series) -> pd.Series:
-        return sr[~sr.isin(self._opts) & sr.notna()]
+    def _bad_values(self, column: ColumnCache) -> pd.Series:
+        _, uniques = column.factorized
+        if column.arrow_strings is not None and uniques.dtype == object \
+                and pd.api.types.infer_dtype(uniques) == 'string':
+            found = pc.is_in(
+                column.arrow_strings,
+                value_set=pa.array(list(self._opts), type=pa.string())
+            ).to_numpy(zero_copy_only=False)
+        else:
+            found = uniques.isin(self._opts).to_numpy()
+        return column.sr[column.by_unique(~found)]
 
     def to_markdown(self) -> str:
         return '\n'.join(["- Options:"]+[
@@ -84,15 +399,21 @@ class OptionsFieldChecker(BaseFieldChecker):
 class IntegerFieldChecker(BaseFieldChecker):
     """Checks that column only contain integer values"""
 
-    def _bad_values(self, sr: pd.Series) -> pd.Series:
-        if sr.dtype.name == 'int64':
+    def _bad_values(self, column: ColumnCache) -> pd.Series:
+        sr = column.sr
+        if is_integer_dtype(sr.dtype):
             return pd.Series([])
-        elif sr.dtype.name == 'float64':
-            return sr[sr.mod(1) > 0]
-        else:
-            # dtype is probably 'object' with strings in it
-            # return the strings
-            return sr[~sr.astype(str).str.match(r'^\d+$') & sr.notna() & (sr.astype(str) != '')]
+        elif is_float_dtype(sr.dtype):
+            values, _ = column.numeric
+            # NaN and infinity have no fraction either
+            with np.errstate(invalid='ignore'):
+                return sr[np.mod(values, 1) > 0]
+        # strings are tested as written, their float may have lost digits
+        strings = column.unique_strings
+        return sr[column.by_unique(~column.match(r'^\d+$') & (strings != ''))]
+
+    def satisfied_by(self, stats) -> bool:
+        return stats.kind == 'integer'
 
     def to_markdown(self) -> str:
         return "- Integer"
@@ -101,16 +422,46 @@ class IntegerFieldChecker(BaseFieldChecker):
 class FloatFieldChecker(BaseFieldChecker):
     """Checks that column only contain float (or integer) values"""
 
-    def _bad_values(self, sr: pd.Series) -> pd.Series:
-        if sr.dtype.name in ['int64', 'float64']:
+    def _bad_values(self, column: ColumnCache) -> pd.Series:
+        sr = column.sr
+        if is_integer_dtype(sr.dtype) or is_float_dtype(sr.dtype):
             return pd.Series([])
-        else:
-            return sr[~sr.astype(str).str.match(r'^(\d*\.)?\d+$') & sr.notna() & (sr.astype(str) != '')]
+        _, not_numeric = column.numeric
+        return sr[not_numeric]
+
+    def satisfied_by(self, stats) -> bool:
+        return stats.kind in ['integer', 'float']
 
     def to_markdown(self) -> str:
         return "- Float"
 
 
+class RangeFieldCheckerState(FieldCheckerState):
+    """Reports out-of-range values only if no chunk has non-numeric values"""
+
+    def __init__(self, checker: "RangeFieldChecker") -> None:
+        super().__init__(checker)
+        self._not_numeric = FieldCheckerState(checker)
+
+    def update(self, sr: pd.Series, column: ColumnCache or None = None) -> None:
+        column = column or ColumnCache(sr)
+        res = FloatFieldChecker._bad_values(self._checker, column)
+        if res.size > 0:
+            self._not_numeric._add(res)
+        elif self._not_numeric.result() is None:
+            self._add(self._checker._bad_values(column))
+
+    def merge(self, other: "RangeFieldCheckerState") -> None:
+        self._not_numeric.merge(other._not_numeric)
+        super().merge(other)
+
+    def result(self) -> pd.Series or None:
+        res = self._not_numeric.result()
+        if res is not None:
+            return res
+        return super().result()
+
+
 class RangeFieldChecker(FloatFieldChecker):
     """Checks that column only contain values in a range
 
@@ -135,11 +486,23 @@ class RangeFieldChecker(FloatFieldChecker):
         self._low = low
         self._high = high
 
-    def _bad_values(self, sr: pd.Series) -> pd.Series:
-        res = super()._bad_values(sr)
+    def _bad_values(self, column: ColumnCache) -> pd.Series:
+        res = super()._bad_values(column)
         if res.size > 0:
             return res
-        return sr[(sr < self._low) | (sr > self._high)]
+        # numbers written as strings are compared as numbers
+        values, _ = column.numeric
+        return column.sr[(values < self._low) | (values > self._high)]
+
+    def new_state(self) -> FieldCheckerState:
+        return RangeFieldCheckerState(self)
+
+    def satisfied_by(self, stats) -> bool:
+        return (
+            super().satisfied_by(stats)
+            and stats.min is not None and stats.max is not None
+            and self._low <= stats.min and stats.max <= self._high
+        )
 
     def to_markdown(self) -> str:
         return "- Range: `%d` -> `%d`" % (self._low, self._high)
@@ -149,15 +512,21 @@ class TitleCaseFieldChecker(BaseFieldChecker):
     """Checks that values are in title case
     """
 
-    def _bad_values(self, sr: pd.Series) -> pd.Series:
-        return sr[
-            sr.notna() & sr.fillna('').astype(str).map(
+    def _bad_values(self, column: ColumnCache) -> pd.Series:
+        if column.arrow_strings is not None:
+            # in ASCII a word's first letter changes in upper case only
+            # if it is a lowercase letter
+            return column.sr[column.by_unique(pc.match_substring_regex(
+                column.arrow_strings, r'^[a-z][^ ]*( [a-z][^ ]*)*$'
+            ).to_numpy(zero_copy_only=False))]
+        return column.sr[column.by_unique(
+            column.unique_strings.map(
                 lambda x: all([
                     e != '' and e[0].upper() != e[0]
                     for e in x.split(' ')
                 ])
             )
-        ]
+        )]
 
     def to_markdown(self) -> str:
         return "- Title case"
@@ -171,11 +540,8 @@ class MatchRegexFieldChecker(BaseFieldChecker):
         super().__init__()
         self._pattern = pattern
 
-    def _bad_values(self, sr: pd.Series) -> pd.Series:
-        return sr[
-            sr.notna() &
-            ~sr.fillna('').astype(str).str.match(self._pattern)
-        ]
+    def _bad_values(self, column: ColumnCache) -> pd.Series:
+        return column.sr[column.by_unique(~column.match(self._pattern))]
 
     def to_markdown(self) -> str:
         return "<li>Match regexp: <code>%s</code></li>" % self._pattern
@@ -1,15 +1,22 @@
+import hashlib
+import io
 import pathlib
 import traceback
 import sys
-from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
 from typing import Iterator
 
 import pandas as pd
 from termcolor import colored
 
-from datavalid.exceptions import TaskValidationError
+from datavalid.exceptions import BadConfigError, ColumnError, TaskValidationError
 
-from .utils import indent, TERM_COLS
+from . import __version__
+from .utils import hash_obj, indent, TERM_COLS
+from .cache import Cache
+from .frame_cache import FrameCache
+from .reader import PandasReader, get_reader, is_columnar
 from .schema import Schema
 from .spinner import Spinner
 from .task import Task
@@ -24,6 +31,7 @@ class File(object):
     _schema: Schema
     _fields: list[str]
     _save_bad_rows_to: str or None
+    _chunksize: int or None
 
     def __init__(
         self,
@@ -31,7 +39,16 @@ class File(object):
         filename: str,
         schema: Schema,
         save_bad_rows_to: str or None = None,
-        no_spinner: bool = False
+        no_spinner: bool = False,
+        chunksize: int or None = None,
+        only_referenced_columns: bool or None = None,
+        engine: str or None = None,
+        cache: Cache or None = None,
+        append_only: bool = False,
+        task_threads: int or None = None,
+        stop_on_first_failure: bool or None = None,
+        report_all_groups: bool or None = None,
+        max_reported_rows: int or None = None
     ) -> None:
         """Creates a new instance of File
 
@@ -49,17 +66,94 @@ class File(object):
             no_spinner (bool):
                 don't show spinner during processing. Useful during
                 tests
+            chunksize (int):
+                if given then columns are validated by streaming the
+                file in chunks of this many rows instead of reading
+                it into memory at once
+            only_referenced_columns (bool):
+                only read columns that are declared in the schema or
+                read by validation tasks. Offending rows will then only
+                show these columns. Defaults to True for Parquet and
+                Feather files and False for CSV files.
+            engine (str):
+                CSV parser to use, either "pandas" (default) or "pyarrow".
+                "pyarrow" parses with multiple threads and falls back to
+                "pandas" if pyarrow is not installed. Files ending with
+                ".parquet" or ".feather" are read with pyarrow regardless.
+            cache (Cache):
+                on-disk caches shared by all files
+            append_only (bool):
+                whether rows are only ever appended to this file. If set
+                then after a successful run, the next run only validates
+                rows appended since then. Requires `cache`.
+            task_threads (int):
+                if greater than 1 then run up to this many validation tasks
+                at once in a thread pool. Results are still reported in the
+                order tasks are declared.
+            stop_on_first_failure (bool):
+                whether to stop running validation tasks after the first
+                failed task. Defaults to True.
+            report_all_groups (bool):
+                if True then validation tasks with `group_by` report offending
+                rows of all failing groups and how many offending rows each
+                group has, instead of only the first failing group.
+            max_reported_rows (int):
+                if given then each failed task reports at most this many
+                offending rows, and with `report_all_groups` lists the counts
+                of at most this many groups
+
+        Raises:
+            BadConfigError: There's a problem with passed-in arguments
 
         Returns:
             no value
         """
+        if chunksize is not None and (type(chunksize) is not int or chunksize <= 0):
+            raise BadConfigError(['chunksize'], 'should be a positive integer')
         self._datadir = datadir
         self._filepath = self._datadir / filename
+        if only_referenced_columns is None:
+            only_referenced_columns = is_columnar(self._filepath)
+        if type(only_referenced_columns) is not bool:
+            raise BadConfigError(
+                ['only_referenced_columns'], 'should be either true or false')
+        if task_threads is not None and (type(task_threads) is not int or task_threads <= 0):
+            raise BadConfigError(['task_threads'], 'should be a positive integer')
+        if stop_on_first_failure is None:
+            stop_on_first_failure = True
+        if type(stop_on_first_failure) is not bool:
+            raise BadConfigError(
+                ['stop_on_first_failure'], 'should be either true or false')
+        if report_all_groups is None:
+            report_all_groups = False
+        if type(report_all_groups) is not bool:
+            raise BadConfigError(
+                ['report_all_groups'], 'should be either true or false')
+        if max_reported_rows is not None and (type(max_reported_rows) is not int or max_reported_rows <= 0):
+            raise BadConfigError(
+                ['max_reported_rows'], 'should be a positive integer')
+        if type(append_only) is not bool:
+            raise BadConfigError(['append_only'], 'should be either true or false')
+        if append_only and cache is None:
+            raise BadConfigError(
+                ['append_only'], 'requires key "cache" at the top level')
+        if append_only and is_columnar(self._filepath):
+            raise BadConfigError(
+                ['append_only'], 'is only supported for CSV files')
         self._no_spinner = no_spinner
         self._save_bad_rows_to = save_bad_rows_to
         self._fields = list()
         self._schema = schema
         self._tasks = []
+        self._chunksize = chunksize
+        self._only_referenced_columns = only_referenced_columns
+        self._reader = get_reader(engine, self._filepath)
+        self._cache = cache
+        self._append_only = append_only
+        self._task_threads = task_threads
+        self._stop_on_first_failure = stop_on_first_failure
+        self._report_all_groups = report_all_groups
+        self._max_reported_rows = max_reported_rows
 
     def _col_err_msg(self, col: str, err_msg: str) -> str:
         return indent("%s column %s %s" % (
@@ -74,57 +168,298 @@ class File(object):
             with Spinner(name, indent=indent) as spinner:
                 yield spinner
 
-    def _validate_schema(self, df: pd.DataFrame) -> Iterator[str]:
-        for err in self._schema.column_errors(df):
+    def _read_options(self, stats: dict, numeric_dtypes: bool = True) -> dict:
+        return {
+            'columns': (
+                self._schema.referenced_columns(stats)
+                if self._only_referenced_columns else None
+            ),
+            'dtype': self._schema.reader_dtypes(numeric_dtypes),
+        }
+
+    def _read(self, stats: dict, use_cache: bool = True) -> pd.DataFrame:
+        filters = self._schema.to_filters()
+        opts = self._read_options(stats)
+        tables = None if self._cache is None else self._cache.tables
+        if tables is not None:
+            fp = self._cache.fingerprint(self._filepath)
+            cache_key = dict(
+                opts, filters=filters, reader=type(self._reader).__name__,
+                columns=None if opts['columns'] is None else sorted(opts['columns'])
+            )
+            df = tables.load(fp, cache_key) if use_cache else None
+            if df is not None:
+                return df
+        try:
+            df = self._reader.read(self._filepath, filters=filters, **opts)
+        except (ValueError, TypeError):
+            # some values of numeric columns can't be parsed, let the
+            # column checkers report them
+            df = self._reader.read(
+                self._filepath, filters=filters, **self._read_options(stats, False)
+            )
+        if tables is not None:
+            tables.save(fp, cache_key, df)
+        return df
+
+    def _read_chunks(self, stats: dict, numeric_dtypes: bool = True) -> Iterator[pd.DataFrame]:
+        return self._reader.read_chunks(
+            self._filepath, self._chunksize, **self._read_options(stats, numeric_dtypes)
+        )
+
+    def _column_errors(self, df: pd.DataFrame or None, stats: dict, states: dict or None = None, cache: FrameCache or None = None) -> Iterator[ColumnError]:
+        if df is None:
+            try:
+                return list(self._schema.column_errors_from_chunks(
+                    self._read_chunks(stats), stats, states
+                ))
+            except (ValueError, TypeError):
+                if states is not None:
+                    states.clear()
+                return list(self._schema.column_errors_from_chunks(
+                    self._read_chunks(stats, False), stats, states
+                ))
+        if states is not None:
+            return self._schema.column_errors_from_chunks([df], stats, states)
+        return self._schema.column_errors(df, stats, cache)
+
+    def _validate_schema(self, df: pd.DataFrame or None, stats: dict, states: dict or None = None, cache: FrameCache or None = None) -> Iterator[str]:
+        for err in self._column_errors(df, stats, states, cache):
             yield self._col_err_msg(err.column, err.msg)
 
-    def _validate_tasks(self, df: pd.DataFrame) -> bool:
-        for task in self._schema.tasks:
-            with self._spinner(task.name, indent=2):
-                try:
-                    task.run(df)
-                except TaskValidationError as err:
-                    if err.warn:
-                        print(indent(colored("⚠ %s" % task.name, "yellow"), 2))
-                    else:
-                        print(indent(colored("✕ %s" % task.name, "red"), 2))
-                    print(indent(err.err_msg, 4))
-                    if not err.warn and self._save_bad_rows_to is not None:
-                        rows_path = self._datadir / self._save_bad_rows_to
-                        err.rows.to_csv(rows_path, index=False)
-                        print(indent('Saved bad rows to %s' % rows_path, 4))
+    def _run_task(self, task: Task, df: pd.DataFrame, cache: FrameCache or None = None) -> TaskValidationError or str or None:
+        """Runs a task without printing anything
+
+        Returns:
+            None if the task passes, the validation error if it fails or
+            the formatted exception if it raises any other error
+        """
+        try:
+            task.run(df, self._report_all_groups,
+                     self._max_reported_rows, cache)
+        except TaskValidationError as err:
+            return err
+        except Exception:
+            exc_type, exc_value, exc_tb = sys.exc_info()
+            return '\n'.join([indent(
+                'an error occured during task execution: %s' % ''.join(traceback.format_exception_only(
+                    exc_type, exc_value
+                )).strip(),
+                4
+            )]+[
+                indent(line.strip(), 6) for line in traceback.format_tb(exc_tb)
+            ])
+        return None
+
+    def _report_task(self, task: Task, result: TaskValidationError or str or None) -> bool:
+        """Prints result of a task returned by _run_task
+
+        Returns:
+            False if the task failed
+        """
+        if result is None:
+            print(indent(colored("✓ %s" % task.name, "green"), 2))
+            return True
+        if type(result) is str:
+            print(indent(colored("✕ %s" % task.name, "red"), 2))
+            print(result)
+            return False
+        err = result
+        if err.warn:
+            self._warned = True
+            print(indent(colored("⚠ %s" % task.name, "yellow"), 2))
+        else:
+            print(indent(colored("✕ %s" % task.name, "red"), 2))
+        print(indent(err.err_msg, 4))
+        if not err.warn and self._save_bad_rows_to is not None:
+            rows_path = self._datadir / self._save_bad_rows_to
+            err.rows.to_csv(rows_path, index=False)
+            print(indent('Saved bad rows to %s' % rows_path, 4))
+        else:
+            print(indent(err.rows.to_string(
+                line_width=TERM_COLS-4), 4))
+        return err.warn
+
+    def _validate_tasks(self, df: pd.DataFrame, cache: FrameCache) -> bool:
+        tasks = self._schema.tasks
+        executor = None
+        if self._task_threads is not None and self._task_threads > 1 and len(tasks) > 1:
+            # pandas and numpy release the GIL for most of the heavy work,
+            # results are still reported in declaration order
+            executor = ThreadPoolExecutor(min(self._task_threads, len(tasks)))
+            futures = [executor.submit(self._run_task, task, df, cache) for task in tasks]
+        succeed = True
+        try:
+            for i, task in enumerate(tasks):
+                with self._spinner(task.name, indent=2):
+                    if executor is None:
+                        result = self._run_task(task, df, cache)
                     else:
-                        print(indent(err.rows.to_string(
-                            line_width=TERM_COLS-4), 4))
-                    if not err.warn:
-                        return False
-                except Exception:
-                    print(indent(colored("✕ %s" % task.name, "red"), 2))
-                    exc_type, exc_value, exc_tb = sys.exc_info()
-                    print(indent(
-                        'an error occured during task execution: %s' % ''.join(traceback.format_exception_only(
-                            exc_type, exc_value
-                        )).strip(),
-                        4
-                    ))
-                    for line in traceback.format_tb(exc_tb):
-                        print(indent(line.strip(), 6))
-                    return False
-                else:
-                    print(indent(colored("✓ %s" % task.name, "green"), 2))
-        return True
+                        result = futures[i].result()
+                if not self._report_task(task, result):
+                    succeed = False
+                    if self._stop_on_first_failure:
+                        break
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        return succeed
 
-    def valid(self) -> bool:
+    def valid(self, use_cache: bool = True) -> bool:
         """Checks whether this file pass all validation tasks and match schema
+
+        If results are cached then a file that passed without warnings is
+        not validated again until either its content or its schema changes.
+
+        Args:
+            use_cache (bool):
+                if False then don't use cached results or tables. Results of
+                this run are still cached.
+
+        Returns:
+            whether the file is valid
         """
         print("Validating %s" % self._filepath)
-        df = pd.read_csv(self._filepath, low_memory=False)
+        results = None if self._cache is None else self._cache.results
+        if results is not None:
+            fp = self._cache.fingerprint(self._filepath)
+            key = self._result_key()
+            if use_cache and results.passed(fp, key):
+                print(colored(
+                    "  ✓ Unchanged since last successful run", "green"))
+                return True
+        succeed = self._valid(use_cache)
+        if results is not None:
+            results.record(fp, key, succeed and not self._warned)
+        return succeed
+
+    def _result_key(self) -> str:
+        # results of another version or of other reading options may differ
+        return hash_obj([
+            self._schema.config_hash(), __version__, pd.__version__,
+            self._chunksize is not None, type(self._reader).__name__,
+        ])
+
+    def _state_key(self) -> str:
+        opts = self._read_options(dict())
+        return hash_obj([
+            self._schema.config_hash(), __version__, pd.__version__,
+            None if opts['columns'] is None else sorted(opts['columns']),
+            opts['dtype'],
+        ])
+
+    def _snapshot(self) -> dict or None:
+        """Returns size and hash of the file if it ends with a complete row"""
+        h = hashlib.sha1()
+        with self._filepath.open('rb') as f:
+            header = f.readline()
+            f.seek(0)
+            size, last = 0, b''
+            for block in iter(lambda: f.read(1 << 20), b''):
+                h.update(block)
+                size += len(block)
+                last = block
+        if not header.endswith(b'\n') or not last.endswith(b'\n'):
+            return None
+        return {'offset': size, 'sha1': h.hexdigest(), 'header': header}
+
+    def _read_appended(self, state: dict) -> pd.DataFrame or None:
+        """Reads rows appended since the state was saved
+
+        Returns:
+            the appended rows or None if the file was changed in other ways
+        """
+        h = hashlib.sha1()
+        with self._filepath.open('rb') as f:
+            remain = state['offset']
+            while remain > 0:
+                block = f.read(min(remain, 1 << 20))
+                if block == b'':
+                    return None
+                h.update(block)
+                remain -= len(block)
+            if h.hexdigest() != state['sha1']:
+                return None
+            tail = f.read()
+        if tail != b'' and not tail.endswith(b'\n'):
+            return None
+        h.update(tail)
+        state.update(offset=state['offset']+len(tail), sha1=h.hexdigest())
+        opts = self._read_options(dict())
+        if state['dtypes'] is not None:
+            opts['dtype'] = state['dtypes']
+        try:
+            return PandasReader().read(io.BytesIO(state['header']+tail), **opts)
+        except (ValueError, TypeError):
+            return None
+
+    def _valid_appended(self, state: dict) -> bool:
+        """Validates rows appended since the state was saved and updates it
+
+        Returns:
+            False if the appended rows fail or can't be validated against
+            the state. The whole file must then be validated again.
+        """
+        with self._spinner('Validating appended rows', indent=2):
+            df = self._read_appended(state)
+            if df is None:
+                return False
+            if len(self._schema.columns) > 0:
+                for _ in self._schema.column_errors_from_chunks([df], states=state['columns']):
+                    return False
+            for task_state in state['tasks']:
+                if not task_state.append(df):
+                    return False
+        print(colored(
+            "  ✓ All %d appended rows are valid" % df.shape[0], "green"))
+        return True
+
+    def valid_captured(self, use_cache: bool = True) -> tuple[bool, str]:
+        """Same as valid() but returns the output instead of printing it
+
+        Spinners are not shown. This is used to validate files in other
+        processes.
+
+        Args:
+            use_cache (bool):
+                same as in valid()
+
+        Returns:
+            whether the file is valid and the output
+        """
+        no_spinner = self._no_spinner
+        self._no_spinner = True
+        buf = io.StringIO()
+        try:
+            with redirect_stdout(buf):
+                succeed = self.valid(use_cache)
+        finally:
+            self._no_spinner = no_spinner
+        return succeed, buf.getvalue()
+
+    def _valid(self, use_cache: bool) -> bool:
+        self._warned = False
+        state = None
+        if self._append_only:
+            key = self._state_key()
+            state = self._cache.states.load(self._filepath, key) if use_cache else None
+            if state is not None and self._valid_appended(state):
+                self._cache.states.save(self._filepath, key, state)
+                return True
+            state = self._snapshot()
+            if state is not None:
+                state['columns'] = dict()
+        stats = self._reader.column_statistics(self._filepath)
+        df = self._read(stats, use_cache) if self._chunksize is None else None
+        # values such as parsed dates and key hashes are shared between
+        # column checks and tasks
+        cache = None if df is None else FrameCache(df)
         succeed = True
 
         if len(self._schema.columns) > 0:
             msgs = []
             with self._spinner('Validating columns', indent=2) as spinner:
-                for err_msg in self._validate_schema(df):
+                for err_msg in self._validate_schema(df, stats, None if state is None else state['columns'], cache):
                     msgs.append(err_msg)
                 if spinner is not None:
                     spinner.set_postfix_text('\n'.join(msgs))
@@ -136,9 +471,26 @@ class File(object):
                 for err_msg in msgs:
                     print(err_msg)
 
-        if not self._validate_tasks(df):
-            return False
+        if len(self._schema.tasks) > 0:
+            if df is None:
+                df = self._read(stats, use_cache)
+                cache = FrameCache(df)
+            if not self._validate_tasks(df, cache):
+                succeed = False
 
+        if self._append_only:
+            if not succeed or self._warned:
+                state = None
+            elif state is not None:
+                state['dtypes'] = None if df is None else {
+                    col: str(dtype) for col, dtype in df.dtypes.items()
+                }
+                state['tasks'] = [task.new_state() for task in self._schema.tasks]
+                for task_state in state['tasks']:
+                    if not task_state.append(df, check=False):
+                        state = None
+                        break
+            self._cache.states.save(self._filepath, key, state)
         return succeed
 
     def to_markdown(self, relative_to: pathlib.Path or None = None) -> str:
@@ -1,10 +1,12 @@
 from typing import Iterator, List
 
+import numpy as np
 import pandas as pd
 
 from .condition import Condition
 from .group_by import GroupBy
 from .exceptions import BadConfigError
+from .frame_cache import FrameCache
 
 
 class Filter(object):
@@ -47,6 +49,71 @@ class Filter(object):
         except TypeError as e:
             raise BadConfigError(['group_by'], str(e))
 
+    def referenced_columns(self) -> set[str]:
+        """Returns names of all columns this filter reads
+
+        Returns:
+            a set of column names
+        """
+        return self._condition.referenced_columns() | self._group_by.referenced_columns()
+
+    def to_filters(self) -> list[list[tuple]] or None:
+        """Converts the `where` condition into row filters for columnar readers.
+
+        Returns:
+            the filters or None if rows can't be narrowed down
+        """
+        return self._condition.to_filters()
+
+    @property
+    def group_columns(self) -> list[str]:
+        """Names of columns to group by, empty if data is treated as one group"""
+        return self._group_by.columns or []
+
+    def positions(self, df: pd.DataFrame, cache: FrameCache or None = None) -> np.ndarray:
+        """Returns positions of rows passing the condition.
+
+        Rows that don't belong to any group (because of a missing group key)
+        are left out, so the result holds the same rows as all groups
+        emitted by filter().
+
+        Args:
+            df (pd.DataFrame): the data to filter
+            cache (FrameCache): cache of `df` to share comparison results
+                with other tasks
+
+        Returns:
+            positions of rows in `df`, in ascending order
+        """
+        mask = self._condition.compile().evaluate(df, cache=cache)
+        if len(self.group_columns) > 0:
+            mask &= df[self.group_columns].notna().all(axis=1).to_numpy()
+        return np.flatnonzero(mask)
+
+    def rows(self, df: pd.DataFrame, columns: list[str] or None = None, cache: FrameCache or None = None) -> pd.DataFrame:
+        """Filters given data without dividing it into groups.
+
+        Rows are indexed by their positions in `df` so that they can be
+        traced back to the original rows.
+
+        Args:
+            df (pd.DataFrame): the data to filter
+            columns (list[str]): if given then only take these columns
+            cache (FrameCache): same as in positions()
+
+        Returns:
+            the filtered data
+        """
+        positions = self.positions(df, cache)
+        if columns is not None:
+            df = df[columns]
+        if positions.size < df.shape[0]:
+            df = df.iloc[positions]
+        # a shallow copy shares data with `df` whatever the pandas version
+        df = df.copy(deep=False)
+        df.index = positions
+        return df
+
     def filter(self, df: pd.DataFrame) -> Iterator[pd.DataFrame]:
         """Filters given data and emit data in groups.
 
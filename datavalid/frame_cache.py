@@ -0,0 +1,83 @@
+import threading
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+
+class FrameCache(object):
+    """Memoizes values computed from a table
+
+    Tasks of a file all run on the same table, or on subsets of its rows
+    after a `where` condition. A value is computed once from the whole table
+    and shared by all of them: a cache returned by subset() takes its rows
+    from the value of the whole table instead of computing it again.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        """Creates a new instance of FrameCache
+
+        Args:
+            df (pd.DataFrame): the whole table
+
+        Returns:
+            no value
+        """
+        self._df = df
+        self._root = self
+        self._positions = None
+        self._values = dict()
+        self._locks = dict()
+        self._lock = threading.Lock()
+
+    def subset(self, positions: np.ndarray) -> "FrameCache":
+        """Returns a cache for some rows of this table
+
+        Args:
+            positions (np.ndarray): positions of the rows in this table
+
+        Returns:
+            a cache that shares values with this cache
+        """
+        sub = FrameCache.__new__(FrameCache)
+        sub._root = self._root
+        sub._positions = positions if self._positions is None \
+            else self._positions[positions]
+        return sub
+
+    def has(self, key) -> bool:
+        """Returns whether the value for a key is already computed
+
+        Args:
+            key (hashable): identifies the value
+
+        Returns:
+            True if get() would not compute the value
+        """
+        return key in self._root._values
+
+    def get(self, key, compute: Callable[[pd.DataFrame], object], take: Callable[[object, np.ndarray], object]) -> object:
+        """Returns the value for the rows of this cache
+
+        Args:
+            key (hashable):
+                identifies the value
+            compute (callable):
+                computes the value from the whole table. This is called at
+                most once per key, even when tasks run in several threads.
+                If it raises then nothing is cached.
+            take (callable):
+                takes the part of a value that belongs to rows at the given
+                positions of the whole table. Positions are None for the
+                whole table itself.
+
+        Returns:
+            the value
+        """
+        root = self._root
+        with root._lock:
+            lock = root._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in root._values:
+                root._values[key] = compute(root._df)
+        return take(root._values[key], self._positions)
@@ -25,6 +25,21 @@ class GroupBy(object):
         else:
             self._columns = None
 
+    @property
+    def columns(self) -> list[str] or None:
+        """Names of columns to group by, None if data is treated as one group"""
+        return self._columns
+
+    def referenced_columns(self) -> set[str]:
+        """Returns names of columns to group by
+
+        Returns:
+            a set of column names
+        """
+        if self._columns is None:
+            return set()
+        return set(self._columns)
+
     def groups(self, df: pd.DataFrame) -> Iterator[pd.DataFrame]:
         """Divides the given data into groups and returns them as an iterator
 
@@ -37,5 +52,5 @@ class GroupBy(object):
         if self._columns is None:
             yield df
         else:
-            for _, frame in df.groupby(self._columns):
+            for _, frame in df.groupby(self._columns, observed=True):
                 yield frame
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from .frame_cache import FrameCache
+
+
+def factorize(sr: pd.Series) -> tuple[np.ndarray, pd.Series]:
+    """Returns the code of each value of a column and the distinct values
+
+    Unlike pd.factorize(), values that compare equal but are written
+    differently, such as 1, 1.0 and True in an object column, are kept
+    apart so that checks on the string form of values see each of them.
+
+    Args:
+        sr (pd.Series): the column
+
+    Returns:
+        the code of each value, -1 for missing values, and the distinct
+        values in order of appearance
+    """
+    if sr.dtype != object:
+        codes, uniques = pd.factorize(sr.array)
+        return codes, pd.Series(uniques)
+    values = sr.to_numpy()
+    strings = pd.api.types.infer_dtype(sr, skipna=True) in ('string', 'empty')
+    if strings:
+        keys = values
+    else:
+        keys = np.array([
+            type(v).__qualname__ + ':' + str(v) for v in values
+        ], dtype=object)
+        keys[sr.isna().to_numpy()] = None
+    codes, uniques = pd.factorize(keys)
+    if any('\0' in k for k in uniques):
+        # pandas' hash table cuts strings at the first NUL character
+        index = dict()
+        codes = np.array([
+            -1 if pd.isna(k) else index.setdefault(k, len(index)) for k in keys
+        ], dtype='int64')
+    elif strings:
+        return codes, pd.Series(uniques, dtype=object)
+    # codes are numbered in order of appearance
+    _, first = np.unique(codes, return_index=True)
+    if codes.size > 0 and codes.min() == -1:
+        first = first[1:]
+    return codes, pd.Series(values[first], dtype=object)
+
+
+def column_hashes(sr: pd.Series) -> np.ndarray:
+    """Returns a 64-bit hash of each value of a column
+
+    Values that duplicated() considers equal always get equal hashes.
+    Different values may get equal hashes too, so callers must confirm
+    matches on the values themselves.
+
+    Args:
+        sr (pd.Series): the column
+
+    Returns:
+        an uint64 array
+    """
+    if isinstance(sr.dtype, np.dtype):
+        kind = sr.dtype.kind
+        if kind == 'f':
+            values = sr.to_numpy()
+            # -0.0 and every NaN payload must hash like 0.0 and NaN
+            values = np.where(np.isnan(values), np.nan, values + 0.0)
+            return pd.util.hash_array(values)
+        if kind in 'iubmM' or (
+            kind == 'O' and pd.api.types.infer_dtype(sr, skipna=True) in ('string', 'empty')
+        ):
+            return pd.util.hash_array(sr.to_numpy())
+    # anything else is factorized, which compares values the same way
+    # duplicated() does
+    codes, _ = pd.factorize(sr.array)
+    return pd.util.hash_array(codes)
+
+
+def key_hashes(df: pd.DataFrame, columns: list[str], cache: FrameCache or None = None) -> np.ndarray:
+    """Returns a 64-bit hash of the key formed by the given columns of each row
+
+    Args:
+        df (pd.DataFrame): the table
+        columns (list[str]): the key columns
+        cache (FrameCache): cache of `df`. If given then hashes of each
+            column are computed once and shared by all checks of the table.
+
+    Returns:
+        an uint64 array
+    """
+    hashes = None
+    for col in columns:
+        if cache is None:
+            col_hashes = column_hashes(df[col])
+        else:
+            col_hashes = cache.get(
+                ('hashes', col),
+                lambda root, col=col: column_hashes(root[col]),
+                lambda value, positions: value if positions is None else value[positions]
+            )
+        if hashes is None:
+            hashes = col_hashes.copy()
+        else:
+            hashes *= np.uint64(0x100000001b3)
+            hashes ^= col_hashes
+    if hashes is None:
+        return np.zeros(df.shape[0], dtype='uint64')
+    return hashes
+
+
+def duplicated(df: pd.DataFrame, columns: list[str], cache: FrameCache or None = None) -> np.ndarray:
+    """Returns which rows have the same key as another row
+
+    Keys are compared by hash in one sort, then rows with a repeated hash
+    are compared on their values to rule out hash collisions.
+
+    Args:
+        df (pd.DataFrame): the table
+        columns (list[str]): the key columns
+        cache (FrameCache): same as in key_hashes()
+
+    Returns:
+        a boolean array, same as `df.duplicated(columns, keep=False)`
+    """
+    hashes = key_hashes(df, columns, cache)
+    result = np.zeros(hashes.size, dtype=bool)
+    sorted_hashes = np.sort(hashes)
+    repeated = sorted_hashes[1:][sorted_hashes[1:] == sorted_hashes[:-1]]
+    if repeated.size == 0:
+        return result
+    candidates = np.flatnonzero(np.isin(hashes, repeated))
+    exact = df.iloc[candidates].duplicated(subset=columns, keep=False)
+    result[candidates[exact.to_numpy()]] = True
+    return result
@@ -0,0 +1,396 @@
+import pathlib
+import re
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import BadConfigError
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    from pyarrow import feather as pa_feather
+    from pyarrow import parquet as pq
+except ImportError:
+    pa = None
+    pa_csv = None
+    pa_feather = None
+    pq = None
+
+
+class ColumnStatistics(object):
+    """Statistics of a column aggregated from file metadata
+
+    Attributes:
+        kind (str):
+            "integer", "float" or "other" depending on column type
+        min (int or float or None):
+            minimum value of a numeric column if known
+        max (int or float or None):
+            maximum value of a numeric column if known
+        null_count (int or None):
+            number of null values if known
+    """
+    kind: str
+    min: int or float or None
+    max: int or float or None
+    null_count: int or None
+
+    def __init__(self, kind: str, min=None, max=None, null_count: int or None = None) -> None:
+        self.kind = kind
+        self.min = min
+        self.max = max
+        self.null_count = null_count
+
+
+class PandasReader(object):
+    """Reads CSV files with pandas' C parser
+    """
+
+    def column_statistics(self, filepath: pathlib.Path) -> dict[str, ColumnStatistics]:
+        """Returns statistics of columns that are known without reading data
+
+        Args:
+            filepath (pathlib.Path):
+                the file to read
+
+        Returns:
+            a dictionary of column name and statistics
+        """
+        return dict()
+
+    def read(
+        self,
+        filepath: pathlib.Path,
+        columns: set[str] or None = None,
+        dtype: dict[str, str] or None = None,
+        filters: list[list[tuple]] or None = None
+    ) -> pd.DataFrame:
+        """Reads the whole file into a frame
+
+        Args:
+            filepath (pathlib.Path):
+                the file to read
+            columns (set[str]):
+                if given then only read these columns. Columns that are not
+                in the file are ignored.
+            dtype (dict[str, str]):
+                dtype name of each column. Columns not in this dictionary
+                have their types inferred.
+            filters (list[list[tuple]]):
+                row filters returned by Condition.to_filters(). Readers that
+                support it skip rows not passing the filters, others ignore
+                this argument.
+
+        Raises:
+            ValueError: values can't be parsed according to `dtype`
+            TypeError: values can't be parsed according to `dtype`
+
+        Returns:
+            the read frame
+        """
+        return pd.read_csv(
+            filepath, low_memory=False, **self._options(columns, dtype)
+        )
+
+    def read_chunks(
+        self,
+        filepath: pathlib.Path,
+        chunksize: int,
+        columns: set[str] or None = None,
+        dtype: dict[str, str] or None = None
+    ) -> Iterator[pd.DataFrame]:
+        """Reads the file as consecutive chunks
+
+        Args:
+            filepath (pathlib.Path):
+                the file to read
+            chunksize (int):
+                number of rows in each chunk
+            columns (set[str]):
+                same as in read()
+            dtype (dict[str, str]):
+                same as in read()
+
+        Returns:
+            an iterator of frames
+        """
+        # each chunk would infer its own types, so the types of the whole
+        # file are inferred first and every chunk is read with them
+        dtype = dict(dtype or dict(), **self._inferred_dtypes(
+            filepath, chunksize, columns, dtype or dict()))
+        with pd.read_csv(
+            filepath, chunksize=chunksize, **self._options(columns, dtype)
+        ) as reader:
+            for chunk in reader:
+                yield chunk
+
+    def _inferred_dtypes(self, filepath: pathlib.Path, chunksize: int, columns: set[str] or None, dtype: dict[str, str]) -> dict[str, str]:
+        """Returns dtypes of columns whose chunks infer different types
+
+        Such columns are read as text, or as floats if their chunks mix
+        integers and floats, which is what reading the whole file infers.
+        """
+        kinds = dict()
+        with pd.read_csv(
+            filepath, chunksize=chunksize,
+            usecols=lambda col: col not in dtype and (columns is None or col in columns),
+        ) as reader:
+            for chunk in reader:
+                for col, typ in chunk.dtypes.items():
+                    kinds.setdefault(col, set()).add(typ.kind)
+        result = dict()
+        for col, col_kinds in kinds.items():
+            if len(col_kinds) == 1:
+                continue
+            result[col] = 'float64' if col_kinds == {'i', 'f'} else str
+        return result
+
+    def _options(self, columns: set[str] or None, dtype: dict[str, str] or None) -> dict:
+        opts = {'dtype': dtype}
+        if columns is not None:
+            opts['usecols'] = lambda col: col in columns
+        return opts
+
+
+class ArrowReader(PandasReader):
+    """Reads CSV files with pyarrow's multithreaded parser
+
+    Values are parsed into the same types that pandas would produce, so
+    validation results do not depend on the reader. Reading in chunks is
+    delegated to pandas.
+    """
+
+    def read(
+        self,
+        filepath: pathlib.Path,
+        columns: set[str] or None = None,
+        dtype: dict[str, str] or None = None,
+        filters: list[list[tuple]] or None = None
+    ) -> pd.DataFrame:
+        dtype = dtype or dict()
+        # arrow parses dates and timestamps while pandas leaves them as text,
+        # peek at the first block to find these columns and read them as text
+        with pa_csv.open_csv(filepath) as reader:
+            schema = reader.schema
+        include_columns = [
+            name for name in schema.names
+            if columns is None or name in columns
+        ]
+        # integers are read as int64 to keep all their digits. A column
+        # that fails is read again as floats so that "3.0" is accepted like
+        # pandas does, then converted to Int64 below.
+        int_columns = {
+            name for name in include_columns if dtype.get(name) == 'Int64'
+        }
+        while True:
+            try:
+                table = self._read_table(
+                    filepath, schema, include_columns, dtype, int_columns)
+                break
+            except pa.ArrowInvalid as e:
+                match = re.match(r'In CSV column #(\d+)', str(e))
+                if match is None:
+                    if len(int_columns) == 0:
+                        raise
+                    int_columns = set()
+                    continue
+                name = schema.names[int(match.group(1))]
+                if name not in int_columns:
+                    raise
+                int_columns.remove(name)
+        df = table.to_pandas()
+        # arrow turns missing text into None where pandas gives NaN
+        for name, typ in df.dtypes.items():
+            if typ == object:
+                df[name] = df[name].where(df[name].notna(), np.nan)
+        return df.astype({
+            name: typ for name, typ in dtype.items()
+            if name in df.columns and typ != 'category'
+        })
+
+    def _read_table(self, filepath: pathlib.Path, schema, include_columns: list[str], dtype: dict[str, str], int_columns: set[str]):
+        column_types = dict()
+        for name in include_columns:
+            typ = schema.field(name).type
+            if name in dtype and dtype[name] == 'category':
+                column_types[name] = pa.dictionary(pa.int32(), pa.string())
+            elif name in int_columns:
+                column_types[name] = pa.int64()
+            elif name in dtype:
+                column_types[name] = pa.float64()
+            elif pa.types.is_temporal(typ):
+                column_types[name] = pa.string()
+        return pa_csv.read_csv(
+            filepath,
+            read_options=pa_csv.ReadOptions(use_threads=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=include_columns,
+                column_types=column_types,
+                strings_can_be_null=True,
+            ),
+        )
+
+
+class FeatherReader(PandasReader):
+    """Reads Feather (Arrow IPC) files through memory mapping
+
+    Columns are already typed so `dtype` is ignored.
+    """
+
+    def _table(self, filepath: pathlib.Path, columns: set[str] or None):
+        table = pa_feather.read_table(filepath, memory_map=True)
+        return table.select([
+            name for name in table.schema.names if columns is None or name in columns
+        ])
+
+    def read(
+        self,
+        filepath: pathlib.Path,
+        columns: set[str] or None = None,
+        dtype: dict[str, str] or None = None,
+        filters: list[list[tuple]] or None = None
+    ) -> pd.DataFrame:
+        return self._table(filepath, columns).to_pandas()
+
+    def read_chunks(
+        self,
+        filepath: pathlib.Path,
+        chunksize: int,
+        columns: set[str] or None = None,
+        dtype: dict[str, str] or None = None
+    ) -> Iterator[pd.DataFrame]:
+        for batch in self._table(filepath, columns).to_batches(chunksize):
+            yield batch.to_pandas()
+
+
+class ParquetReader(PandasReader):
+    """Reads Parquet files
+
+    Only requested columns are read, row filters are pushed down to skip
+    row groups and rows, and row group statistics are exposed so that some
+    column checks need not scan data. Columns are already typed so `dtype`
+    is ignored.
+    """
+
+    def _columns(self, pf, columns: set[str] or None) -> list[str]:
+        return [
+            name for name in pf.schema_arrow.names
+            if columns is None or name in columns
+        ]
+
+    def column_statistics(self, filepath: pathlib.Path) -> dict[str, ColumnStatistics]:
+        pf = pq.ParquetFile(filepath)
+        meta = pf.metadata
+        res = dict()
+        for idx, field in enumerate(pf.schema_arrow):
+            if pa.types.is_integer(field.type):
+                kind = 'integer'
+            elif pa.types.is_floating(field.type):
+                kind = 'float'
+            else:
+                kind = 'other'
+            lows, highs, null_count = [], [], 0
+            for i in range(meta.num_row_groups):
+                col = meta.row_group(i).column(idx)
+                if col.path_in_schema != field.name:
+                    # nested column, statistics can't be mapped back
+                    null_count = None
+                    break
+                st = col.statistics
+                if st is None or not st.has_null_count:
+                    null_count = None
+                else:
+                    if null_count is not None:
+                        null_count += st.null_count
+                    if st.has_min_max and kind != 'other':
+                        lows.append(st.min)
+                        highs.append(st.max)
+            res[field.name] = ColumnStatistics(kind, null_count=null_count)
+            if kind != 'other' and len(lows) == meta.num_row_groups and len(lows) > 0:
+                res[field.name].min = min(lows)
+                res[field.name].max = max(highs)
+        return res
+
+    def read(
+        self,
+        filepath: pathlib.Path,
+        columns: set[str] or None = None,
+        dtype: dict[str, str] or None = None,
+        filters: list[list[tuple]] or None = None
+    ) -> pd.DataFrame:
+        cols = self._columns(pq.ParquetFile(filepath), columns)
+        if filters:
+            try:
+                return pq.read_table(filepath, columns=cols, filters=filters).to_pandas()
+            except pa.ArrowException:
+                # filter values whose type does not match the column, the
+                # condition is applied after reading anyway
+                pass
+        return pq.read_table(filepath, columns=cols).to_pandas()
+
+    def read_chunks(
+        self,
+        filepath: pathlib.Path,
+        chunksize: int,
+        columns: set[str] or None = None,
+        dtype: dict[str, str] or None = None
+    ) -> Iterator[pd.DataFrame]:
+        pf = pq.ParquetFile(filepath)
+        for batch in pf.iter_batches(batch_size=chunksize, columns=self._columns(pf, columns)):
+            yield batch.to_pandas()
+
+
+engines = {
+    'pandas': PandasReader,
+    'pyarrow': ArrowReader,
+}
+
+
+columnar_readers = {
+    '.parquet': ParquetReader,
+    '.feather': FeatherReader,
+}
+
+
+def is_columnar(filepath: pathlib.Path) -> bool:
+    """Returns whether the file is in a columnar format"""
+    return filepath.suffix.lower() in columnar_readers
+
+
+def get_reader(engine: str or None = None, filepath: pathlib.Path or None = None) -> PandasReader:
+    """Returns reader for the given file
+
+    Parquet and Feather files are recognized by their extension, all other
+    files are read as CSV with the named engine.
+
+    Args:
+        engine (str):
+            either "pandas" or "pyarrow". Defaults to "pandas". If pyarrow
+            is not installed then a pandas reader is returned instead.
+        filepath (pathlib.Path):
+            the file to read
+
+    Raises:
+        BadConfigError: engine is not known or pyarrow is required but not
+            installed
+
+    Returns:
+        the reader
+    """
+    if engine is None:
+        engine = 'pandas'
+    if engine not in engines:
+        raise BadConfigError(
+            ['engine'], 'should be one of %s' % ', '.join('"%s"' % k for k in engines)
+        )
+    if filepath is not None and is_columnar(filepath):
+        if pa is None:
+            raise BadConfigError(
+                [], 'pyarrow is required to read %s files' % filepath.suffix
+            )
+        return columnar_readers[filepath.suffix.lower()]()
+    if engine == 'pyarrow' and pa is None:
+        engine = 'pandas'
+    return engines[engine]()
@@ -1,10 +1,13 @@
-from typing import Iterator
+from typing import Iterable, Iterator
 
 import pandas as pd
 
 from .exceptions import BadConfigError, ColumnMissingError, ColumnValidationError, ColumnError
 from .column_schema import ColumnSchema
+from .field_checkers import ColumnCache
+from .frame_cache import FrameCache
 from .task import Task
+from .utils import hash_obj
 
 
 class Schema(object):
@@ -27,6 +30,7 @@ class Schema(object):
             no value
         """
         self.name = name
+        self._config = {'columns': columns, 'validation_tasks': validation_tasks}
         self._column_names = list()
         self.columns = dict()
         self.tasks = []
@@ -83,7 +87,77 @@ class Schema(object):
                         ['validation_tasks', i], str(e)
                     )
 
-    def column_errors(self, df: pd.DataFrame) -> Iterator[ColumnError]:
+    def config_hash(self) -> str:
+        """Returns a hash of the columns and tasks this schema was created with
+
+        Returns:
+            hex digest that changes whenever the schema definition changes
+        """
+        return hash_obj(self._config)
+
+    def referenced_columns(self, stats: dict or None = None) -> set[str]:
+        """Returns names of all columns declared in this schema or read by its tasks
+
+        Args:
+            stats (dict[str, ColumnStatistics]):
+                statistics of columns read from file metadata. Declared columns
+                proven valid by their statistics are left out unless a task
+                reads them.
+
+        Returns:
+            a set of column names
+        """
+        stats = stats or dict()
+        return set(
+            col for col, col_schema in self.columns.items()
+            if not col_schema.satisfied_by(stats.get(col))
+        ).union(*[
+            task.referenced_columns() for task in self.tasks
+        ])
+
+    def to_filters(self) -> list[list[tuple]] or None:
+        """Returns row filters that a columnar reader can push down.
+
+        Rows can only be filtered while reading when no column is declared and
+        every task has a `where` condition. The filters are then the union of
+        those conditions.
+
+        Returns:
+            the filters or None if all rows must be read
+        """
+        if len(self.columns) > 0 or len(self.tasks) == 0:
+            return None
+        filters = []
+        for task in self.tasks:
+            task_filters = task.to_filters()
+            if task_filters is None:
+                return None
+            for conj in task_filters:
+                if conj not in filters:
+                    filters.append(conj)
+        return filters
+
+    def reader_dtypes(self, numeric: bool = True) -> dict[str, str]:
+        """Returns dtypes that columns of this schema should be read as
+
+        Args:
+            numeric (bool):
+                whether to include numeric dtypes. Values that can't be parsed
+                as numbers make the whole read fail, so a caller may retry
+                without numeric dtypes and leave such values to column checkers.
+
+        Returns:
+            a dictionary of column name and dtype name
+        """
+        dtypes = dict()
+        for col, col_schema in self.columns.items():
+            dtype = col_schema.reader_dtype()
+            if dtype is None or (not numeric and dtype != 'category'):
+                continue
+            dtypes[col] = dtype
+        return dtypes
+
+    def column_errors(self, df: pd.DataFrame, stats: dict or None = None, cache: FrameCache or None = None) -> Iterator[ColumnError]:
         """Validates and returns column errors as a generator.
 
         If this doesn't yield anything, that means the frame matches the schema.
@@ -91,16 +165,73 @@ class Schema(object):
         Args:
             df (pd.DataFrame):
                 the frame to validate
+            stats (dict[str, ColumnStatistics]):
+                statistics of columns read from file metadata. Checks proven
+                to pass by these statistics are skipped.
+            cache (FrameCache):
+                cache of `df` shared with validation tasks
 
         Returns:
             a generator that yield ColumnError
         """
+        stats = stats or dict()
         for col, col_schema in self.columns.items():
+            if col_schema.satisfied_by(stats.get(col)):
+                continue
             if col not in df.columns:
                 yield ColumnMissingError(col)
             else:
                 try:
-                    col_schema.validate(df.loc[:, col])
+                    col_schema.validate(df.loc[:, col], stats.get(col), cache)
+                except ColumnValidationError as e:
+                    yield e
+
+    def column_errors_from_chunks(self, chunks: Iterable[pd.DataFrame], stats: dict or None = None, states: dict or None = None) -> Iterator[ColumnError]:
+        """Validates a frame given as consecutive chunks and returns column errors as a generator.
+
+        Only the checker states of each column are kept between chunks, so
+        the whole frame never needs to be in memory. Errors are the same as
+        those yielded by `column_errors` on the concatenated frame.
+
+        Args:
+            chunks (iterable of pd.DataFrame):
+                consecutive chunks of the frame to validate
+            stats (dict[str, ColumnStatistics]):
+                same as in column_errors()
+            states (dict):
+                if given then checker states of each column are kept in this
+                dictionary after all chunks are consumed. States already in it
+                are continued from, so rows appended to a frame can be
+                validated without the rest of the frame.
+
+        Returns:
+            a generator that yield ColumnError
+        """
+        stats = stats or dict()
+        if states is None:
+            states = dict()
+        present = None
+        for chunk in chunks:
+            if present is None:
+                present = set(chunk.columns)
+                for col, col_schema in self.columns.items():
+                    if col in present and col not in states \
+                            and not col_schema.satisfied_by(stats.get(col)):
+                        states[col] = col_schema.new_states(stats.get(col))
+            for col, col_states in states.items():
+                sr = chunk.loc[:, col]
+                column = ColumnCache(sr)
+                for state in col_states.values():
+                    state.update(sr, column)
+        present = present or set()
+        for col, col_schema in self.columns.items():
+            if col_schema.satisfied_by(stats.get(col)):
+                continue
+            if col not in present:
+                yield ColumnMissingError(col)
+            else:
+                try:
+                    col_schema.validate_states(states[col])
                 except ColumnValidationError as e:
                     yield e
 
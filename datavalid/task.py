@@ -1,9 +1,10 @@
 import pandas as pd
 
 from .checkers import (
-    NoMoreThanOncePer30DaysChecker, UniqueChecker, EmptyChecker, NoConsecutiveDateChecker, ValidDateChecker
+    CheckerState, NoMoreThanOncePer30DaysChecker, UniqueChecker, EmptyChecker, NoConsecutiveDateChecker, ValidDateChecker
 )
 from .filter import Filter
+from .frame_cache import FrameCache
 from .exceptions import BadConfigError, TaskValidationError
 
 
@@ -129,12 +130,49 @@ class Task(object):
                 'Available checkers are "unique", "empty", "no_consecutive_date", "no_more_than_once_per_30_days"'
             )
 
-    def run(self, df: pd.DataFrame) -> None:
+    def referenced_columns(self) -> set[str]:
+        """Returns names of all columns this task reads
+
+        Returns:
+            a set of column names
+        """
+        return self._filter.referenced_columns() | self._checker.referenced_columns()
+
+    def to_filters(self) -> list[list[tuple]] or None:
+        """Converts the `where` condition into row filters for columnar readers.
+
+        Returns:
+            the filters or None if this task needs all rows
+        """
+        return self._filter.to_filters()
+
+    def new_state(self) -> CheckerState:
+        """Returns a state that remembers rows this task already passed.
+
+        Rows appended to a table that passed this task can then be checked
+        with the state instead of running the task on the whole table again.
+
+        Returns:
+            a new empty state
+        """
+        return self._checker.new_state(self._filter)
+
+    def run(self, df: pd.DataFrame, all_groups: bool = False, max_rows: int or None = None, cache: FrameCache or None = None) -> None:
         """Run validation task and raise an error if not succeed.
 
         Args:
             df (pd.DataFrame):
                 the data to validate
+            all_groups (bool):
+                if True then check all groups in one pass and report
+                offending rows of all failing groups along with the number of
+                offending rows in each group. Otherwise only the first failing
+                group is reported.
+            max_rows (int):
+                if given then report at most this many offending rows. With
+                `all_groups`, counts of at most this many groups are listed.
+            cache (FrameCache):
+                cache of `df` shared by all tasks of a file
 
         Raises:
             TaskValidationError: validation task failed
@@ -142,10 +180,30 @@ class Task(object):
         Returns:
             no value
         """
-        for sub_df in self._filter.filter(df):
-            if not self._checker.check(sub_df):
-                raise TaskValidationError(
-                    self.name, self._err_msg, self._df, self.warn_only)
+        group_columns = self._filter.group_columns
+        # only columns the checker reads are taken from the filtered rows,
+        # whole rows are only taken for the offending rows
+        referenced = self._checker.referenced_columns().union(group_columns)
+        rows = self._filter.rows(
+            df, [col for col in df.columns if col in referenced], cache)
+        if cache is not None:
+            cache = cache.subset(rows.index.to_numpy())
+        if self._checker.check_groups(rows, group_columns, all_groups, cache):
+            return
+        err_msg, bad, counts = self._err_msg, self._df, None
+        if all_groups and len(group_columns) > 0:
+            counts = bad.groupby(group_columns, observed=True).size()
+            err_msg += '\n%d offending rows in %d groups:\n%s' % (
+                bad.shape[0], counts.size,
+                counts.iloc[:max_rows].to_string()
+            )
+            if max_rows is not None and counts.size > max_rows:
+                err_msg += '\n... and %d more groups' % (counts.size - max_rows)
+        if max_rows is not None and bad.shape[0] > max_rows:
+            err_msg += '\nshowing the first %d offending rows' % max_rows
+            bad = bad.iloc[:max_rows]
+        raise TaskValidationError(
+            self.name, err_msg, df.iloc[bad.index.to_numpy()], self.warn_only, counts)
 
     @property
     def _err_msg(self) -> str:
@@ -0,0 +1,89 @@
+import os
+import shutil
+from unittest import TestCase, skipIf
+from tempfile import NamedTemporaryFile, mkdtemp
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from datavalid.cache import Cache, fingerprint, pa
+from datavalid.exceptions import BadConfigError
+
+
+class FingerprintTestCase(TestCase):
+    def test_fingerprint(self):
+        with NamedTemporaryFile(delete=False, mode='w') as f:
+            f.write('a,b\n1,2\n')
+            fp = Path(f.name)
+
+        before = fingerprint(fp)
+        self.assertEqual(before['size'], 8)
+        self.assertEqual(fingerprint(fp), before)
+        with fp.open('w') as f:
+            f.write('a,b\n1,3\n')
+        self.assertNotEqual(fingerprint(fp)['sha1'], before['sha1'])
+
+        os.remove(fp)
+
+
+class CacheTestCase(TestCase):
+    def test_bad_config(self):
+        with self.assertRaises(BadConfigError) as cm:
+            Cache(Path('.'), max_size='1GB')
+        self.assertEqual(cm.exception.path, ['max_size'])
+        self.assertIsNone(Cache(Path('.')).tables)
+
+
+@skipIf(pa is None, 'pyarrow is not installed')
+class TableCacheTestCase(TestCase):
+    def setUp(self):
+        self.datadir = Path(mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.datadir)
+
+    def test_load_save(self):
+        fp = self.datadir / 'person.csv'
+        fp.write_text('first,age\njohn,23\n')
+        df = pd.DataFrame({
+            'first': ['john', None],
+            'age': pd.Series([23, None], dtype='Int64'),
+            'kind': pd.Series(['a', 'b'], dtype='category'),
+        })
+        tables = Cache(self.datadir, tables=True).tables
+        opts = {'columns': None, 'dtype': {'age': 'Int64'}}
+
+        self.assertIsNone(tables.load(fingerprint(fp), opts))
+        tables.save(fingerprint(fp), opts, df)
+        assert_frame_equal(tables.load(fingerprint(fp), opts), df)
+        self.assertIsNone(tables.load(
+            fingerprint(fp), {'columns': ['age'], 'dtype': {}}))
+
+        fp.write_text('first,age\njohn,24\n')
+        self.assertIsNone(tables.load(fingerprint(fp), opts))
+
+        # NaN and None in object columns are loaded as they were saved
+        df = pd.DataFrame({'a': ['x', np.NaN], 'b': ['y', None]})
+        tables.save(fingerprint(fp), opts, df)
+        loaded = tables.load(fingerprint(fp), opts)
+        assert_frame_equal(loaded, df)
+        self.assertIs(type(loaded.a[1]), float)
+        self.assertIsNone(loaded.b[1])
+
+        # mixed types can't be cached
+        tables.save(fingerprint(fp), opts, pd.DataFrame({'a': [1, 'b']}))
+        self.assertIsNone(tables.load(fingerprint(fp), opts))
+
+    def test_evict(self):
+        tables = Cache(self.datadir, tables=True, max_size=0.008).tables
+        df = pd.DataFrame({'a': range(500)})
+        fps = []
+        for i in range(3):
+            fp = self.datadir / ('%d.csv' % i)
+            fp.write_text('a\n%d\n' % i)
+            fps.append(fingerprint(fp))
+            tables.save(fps[-1], {}, df)
+        self.assertIsNone(tables.load(fps[0], {}))
+        assert_frame_equal(tables.load(fps[2], {}), df)
@@ -29,6 +29,26 @@ class UniqueCheckTestCase(TestCase):
         ], index=[1, 2], columns=columns))
 
 
+    def test_check_groups(self):
+        columns = ['first', 'last', 'age']
+        df = pd.DataFrame([
+            ['john', 'smith', 23],
+            ['john', 'doe', 43],
+            ['jane', 'smith', 30],
+            ['jane', 'smith', 23],
+            ['john', 'doe', 23],
+        ], columns=columns)
+        checker = UniqueChecker(['first'])
+        self.assertTrue(checker.check_groups(df.iloc[:3], ['last']))
+        self.assertFalse(checker.check_groups(df, ['last']))
+        self.assertEqual(checker.err_msg, 'Table contains duplicates')
+        assert_frame_equal(checker.df, df.iloc[[1, 4]])
+
+        self.assertFalse(checker.check_groups(df.iloc[:4], ['last']))
+        assert_frame_equal(checker.df, df.iloc[[2, 3]])
+        self.assertTrue(UniqueChecker(['last', 'age']).check_groups(df, ['first']))
+
+
 class EmptyCheckTestCase(TestCase):
     def test_check(self):
         columns = ['first', 'last', 'age']
@@ -84,6 +104,32 @@ class NoConsecutiveDateCheckTestCase(TestCase):
         ], index=[1, 0], columns=columns))
 
 
+    def test_check_groups(self):
+        columns = ['uid', 'event_year', 'event_month', 'event_day']
+        checker = NoConsecutiveDateChecker(date_from={
+            'year_column': 'event_year', 'month_column': 'event_month', 'day_column': 'event_day'
+        })
+        df = pd.DataFrame([
+            ['b', 2000, 1, 6],
+            ['a', 2000, 1, 1],
+            ['b', 2000, 1, 1],
+            ['a', 2000, 1, 3],
+            ['b', 2000, 1, 5],
+            ['a', 2000, 1, 3],
+            ['c', 2000, 2, 29],
+            ['c', 2000, 3, 1],
+            ['a', np.NaN, 1, 2],
+        ], columns=columns)
+        self.assertTrue(checker.check_groups(df.iloc[[1, 2, 3, 5, 8]], ['uid']))
+        self.assertFalse(checker.check_groups(df, ['uid']))
+        self.assertEqual(checker.err_msg, 'Consecutive dates detected')
+        assert_frame_equal(checker.df, df.iloc[[4, 0, 6, 7]])
+
+        # dates that are not next to the earliest date are caught too
+        self.assertFalse(checker.check(df.iloc[[2, 4, 0]]))
+        assert_frame_equal(checker.df, df.iloc[[4, 0]])
+
+
 class NoMoreThanOncePer30DaysCheckerTestCase(TestCase):
     def test_check(self):
         columns = ['event', 'event_year', 'event_month', 'event_day']
@@ -112,6 +158,36 @@ class NoMoreThanOncePer30DaysCheckerTestCase(TestCase):
         ], index=[2, 1, 0], columns=columns))
 
 
+    def test_check_groups(self):
+        columns = ['uid', 'event_year', 'event_month', 'event_day']
+        checker = NoMoreThanOncePer30DaysChecker(date_from={
+            'year_column': 'event_year', 'month_column': 'event_month', 'day_column': 'event_day'
+        })
+        df = pd.DataFrame([
+            ['b', 2000, 1, 4],
+            ['a', 2000, 1, 3],
+            ['b', 2000, 3, 20],
+            ['a', 2000, 3, 3],
+            ['c', 2000, 1, 4],
+            ['c', 2000, 1, 5],
+            ['b', np.NaN, 1, 10],
+            ['b', 2000, 2, 1],
+        ], columns=columns)
+        self.assertTrue(checker.check_groups(df.iloc[:4], ['uid']))
+        self.assertFalse(checker.check_groups(df, ['uid']))
+        self.assertEqual(
+            checker.err_msg, '2 rows detected occur too close together')
+        assert_frame_equal(checker.df, df.iloc[[0, 7]])
+
+        df.loc[5, 'event_month'] = 13
+        self.assertFalse(checker.check_groups(df, ['uid']))
+        self.assertEqual(checker.err_msg, '2 rows detected occur too close together')
+        df.loc[2, 'event_month'] = 13
+        self.assertFalse(checker.check_groups(df, ['uid']))
+        self.assertEqual(checker.err_msg, 'impossible months detected')
+        assert_frame_equal(checker.df, df.iloc[[2]])
+
+
 class ValidDateCheckerTestCase(TestCase):
     def test_check(self):
         columns = ['event', 'event_year', 'event_month', 'event_day']
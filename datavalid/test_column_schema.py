@@ -1,4 +1,5 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -33,3 +34,29 @@ class ColumnSchemaTestCase(TestCase):
             field.validate(pd.Series(['d', 'a', 'c']))
         assert_series_equal(cm.exception.values, pd.Series(['d']))
         self.assertEqual(cm.exception.failed_check, 'options')
+
+    def test_validate_shares_column_cache(self):
+        field = ColumnSchema(
+            "test_field", no_na=True, integer=True, match_regex=r'^\d'
+        )
+        with patch.object(pd.Series, 'astype', autospec=True, side_effect=pd.Series.astype) as astype:
+            field.validate(pd.Series(['1', '20', '300'], dtype=object))
+        # all checkers share the same string view of the column
+        self.assertEqual(astype.call_count, 1)
+
+    def test_reader_dtype(self):
+        self.assertEqual(ColumnSchema('a', integer=True, range=[0, 10]).reader_dtype(), 'Int64')
+        self.assertIsNone(ColumnSchema('a', range=[0, 10]).reader_dtype())
+        self.assertEqual(ColumnSchema('a', float=True).reader_dtype(), 'float64')
+        self.assertEqual(ColumnSchema(
+            'a', options=['x', 'y'], title_case=True).reader_dtype(), 'category')
+        self.assertIsNone(ColumnSchema('a', unique=True).reader_dtype())
+
+        field = ColumnSchema('a', options=['Xy', 'ab'], title_case=True)
+        with self.assertRaises(ColumnValidationError) as cm:
+            field.validate(pd.Series(['Xy', 'ab', np.NaN], dtype='category'))
+        self.assertEqual(cm.exception.failed_check, 'title_case')
+        assert_series_equal(
+            cm.exception.values, pd.Series(['ab'], dtype='category'),
+            check_categorical=False
+        )
@@ -1,10 +1,14 @@
 from unittest import TestCase
 from dataclasses import dataclass, asdict, field
+from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_series_equal, assert_frame_equal
 
-from datavalid.condition import Condition
+from datavalid.condition import ComparePlan, Condition
+from datavalid.exceptions import BadConfigError
+from datavalid.frame_cache import FrameCache
 
 
 class ConditionTestCase(TestCase):
@@ -37,6 +41,18 @@ class ConditionTestCase(TestCase):
                  result=pd.Series([False, True, True])),
             Case(column='age', op='less_equal', value=30,
                  result=pd.Series([True, False, True])),
+            Case(column='first', op='in', value=['john', 'jane'],
+                 result=pd.Series([True, False, True])),
+            Case(column='first', op='not_in', value=['john', 'jane'],
+                 result=pd.Series([False, True, False])),
+            Case(column='age', op='between', value=[25, 43],
+                 result=pd.Series([False, True, True])),
+            Case(column='first', op='match_regex', value='ja',
+                 result=pd.Series([False, False, True])),
+            Case(column='last', op='is_na',
+                 result=pd.Series([False, False, False])),
+            Case(column='last', op='not_na',
+                 result=pd.Series([True, True, True])),
             Case(kwargs={'and': [
                 {'column': 'last', 'op': 'equal', 'value': 'smith'},
                 {'column': 'age', 'op': 'less_than', 'value': 40}
@@ -67,3 +83,129 @@ class ConditionTestCase(TestCase):
         assert_frame_equal(cond.apply(df), pd.DataFrame([
             ['john', 'doe', 23],
         ], columns=['first', 'last', 'age']))
+
+    def test_to_filters(self):
+        self.assertIsNone(Condition().to_filters())
+        self.assertIsNone(
+            Condition(column='first', op='not_equal', value='john').to_filters())
+        self.assertEqual(
+            Condition(column='age', op='greater_equal', value=30).to_filters(),
+            [[('age', '>=', 30)]]
+        )
+        self.assertEqual(Condition(**{'and': [
+            {'or': [
+                {'column': 'last', 'op': 'equal', 'value': 'smith'},
+                {'column': 'last', 'op': 'equal', 'value': 'doe'},
+            ]},
+            {'column': 'age', 'op': 'less_than', 'value': 40},
+            {'column': 'first', 'op': 'not_equal', 'value': 'john'},
+        ]}).to_filters(), [
+            [('last', '=', 'smith'), ('age', '<', 40)],
+            [('last', '=', 'doe'), ('age', '<', 40)],
+        ])
+        self.assertEqual(
+            Condition(column='age', op='between', value=[20, 30]).to_filters(),
+            [[('age', '>=', 20), ('age', '<=', 30)]]
+        )
+        self.assertEqual(
+            Condition(column='kind', op='in', value=['a', 'b']).to_filters(),
+            [[('kind', 'in', ['a', 'b'])]]
+        )
+        self.assertIsNone(Condition(**{'or': [
+            {'column': 'last', 'op': 'equal', 'value': 'smith'},
+            {'column': 'first', 'op': 'not_equal', 'value': 'john'},
+        ]}).to_filters())
+
+    def test_compile(self):
+        df = pd.DataFrame({
+            'first': ['john', 'jean', 'jane', None] * 5,
+            'age': pd.Series([23, 43, None, 30] * 5, dtype='Int64'),
+            'score': [1.5, 2.5, None, 4.0] * 5,
+        })
+        cond = Condition(**{'and': [
+            {'and': [
+                {'column': 'first', 'op': 'not_equal', 'value': 'john'},
+                {'column': 'score', 'op': 'greater_than', 'value': 2},
+            ]},
+            {'or': [
+                {'column': 'age', 'op': 'greater_equal', 'value': 40},
+                {'column': 'age', 'op': 'equal', 'value': 30},
+            ]},
+        ]})
+        plan = cond.compile()
+        self.assertIs(cond.compile(), plan)
+        # the nested `and` is flattened into its parent
+        self.assertEqual(len(plan.children), 3)
+        expected = [False, True, False, True] * 5
+        self.assertEqual(cond.bool_index(df).tolist(), expected)
+        self.assertEqual(
+            plan.evaluate(df, np.arange(4, 8)).tolist(), expected[4:8])
+
+    def test_bool_index_cached(self):
+        df = pd.DataFrame({
+            'kind': ['officer_left', 'officer_join', 'officer_left'] * 4,
+            'age': [23, 43, 30] * 4,
+        })
+        left = {'column': 'kind', 'op': 'equal', 'value': 'officer_left'}
+        cond_a = Condition(**left)
+        cond_b = Condition(**{'and': [
+            left, {'column': 'age', 'op': 'less_than', 'value': 25},
+        ]})
+        cache = FrameCache(df)
+        with patch.object(ComparePlan, '_compare', autospec=True, side_effect=ComparePlan._compare) as compare:
+            assert_series_equal(cond_a.bool_index(df, cache), cond_a.bool_index(df))
+            self.assertEqual(compare.call_count, 2)
+            assert_series_equal(cond_b.bool_index(df, cache), cond_b.bool_index(df))
+            # `kind equal officer_left` is only compared once with the cache
+            self.assertEqual(compare.call_count, 5)
+
+        sub_df = df.iloc[[2, 3, 4]].reset_index(drop=True)
+        self.assertEqual(
+            cond_b.bool_index(sub_df, cache.subset(np.array([2, 3, 4]))).tolist(),
+            cond_b.bool_index(sub_df).tolist(),
+        )
+
+        # children of a selective `and` only compare the undecided rows
+        # unless the whole table is already compared
+        young = {'column': 'age', 'op': 'less_than', 'value': 25}
+        cond_c = Condition(**{'and': [
+            young, {'column': 'age', 'op': 'greater_than', 'value': 20},
+        ]})
+        df.loc[3:, 'age'] = 50
+        cache = FrameCache(df)
+        self.assertEqual(cond_c.bool_index(df, cache).tolist(), [True] + [False] * 11)
+        self.assertTrue(cache.has(Condition(**young).compile().key))
+        self.assertFalse(cache.has(cond_c.compile().children[1].key))
+
+    def test_operators_with_missing_values(self):
+        df = pd.DataFrame({
+            'kind': pd.Series(['a', None, 'b', 'a'], dtype='category'),
+            'age': pd.Series([23, None, 30, 50], dtype='Int64'),
+        })
+        for kwargs, result in [
+            ({'column': 'kind', 'op': 'in', 'value': ['a']},
+             [True, False, False, True]),
+            ({'column': 'kind', 'op': 'not_in', 'value': ['a']},
+             [False, True, True, False]),
+            ({'column': 'kind', 'op': 'is_na'}, [False, True, False, False]),
+            ({'column': 'kind', 'op': 'greater_than', 'value': 'a'},
+             [False, False, True, False]),
+            ({'column': 'kind', 'op': 'between', 'value': ['a', 'a']},
+             [True, False, False, True]),
+            ({'column': 'kind', 'op': 'match_regex', 'value': '[ab]$'},
+             [True, False, True, True]),
+            ({'column': 'age', 'op': 'between', 'value': [20, 30]},
+             [True, False, True, False]),
+        ]:
+            self.assertEqual(
+                Condition(**kwargs).bool_index(df).tolist(), result)
+
+        with self.assertRaises(BadConfigError) as cm:
+            Condition(column='kind', op='in', value='a')
+        self.assertEqual(cm.exception.path, ['value'])
+        with self.assertRaises(BadConfigError):
+            Condition(column='kind', op='is_na', value='a')
+        with self.assertRaises(BadConfigError):
+            Condition(column='kind', op='match_regex', value='[a')
+        with self.assertRaises(BadConfigError):
+            Condition(column='kind', op='like', value='a')
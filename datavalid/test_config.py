@@ -1,8 +1,10 @@
 import os
+import shutil
 import sys
 from unittest import TestCase
+from unittest.mock import patch
 from contextlib import redirect_stdout
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, mkdtemp
 from pathlib import Path
 from io import StringIO
 
@@ -48,6 +50,11 @@ class ConfigTestCase(TestCase):
                             'name': 'the smiths should have unique first name',
                             'where': {'column': 'last', 'op': 'equal', 'value': 'smith'},
                             'unique': 'first'
+                        },
+                        {
+                            'name': 'the does should have unique first name',
+                            'where': {'column': 'last', 'op': 'in', 'value': ['doe']},
+                            'unique': 'first'
                         }
                     ],
                 },
@@ -61,18 +68,66 @@ class ConfigTestCase(TestCase):
                 }
             }, no_spinner=True)
 
-        buf = StringIO()
-        with redirect_stdout(buf):
-            conf.run()
-            sys.stdout.flush()
-        self.assertEqual(buf.getvalue(), '\n'.join([
-            'Validating ' + str(fp_1),
-            '  [32m✓ the smiths should have unique first name[0m',
-            'Validating ' + str(fp_2),
-            '[32m  ✓ All columns match schema[0m',
-            'All good!',
-            '',
-        ]))
+        for jobs in [None, 2]:
+            buf = StringIO()
+            with redirect_stdout(buf):
+                self.assertEqual(conf.run(jobs=jobs), 0)
+                sys.stdout.flush()
+            self.assertEqual(buf.getvalue(), '\n'.join([
+                'Validating ' + str(fp_1),
+                '  [32m✓ the smiths should have unique first name[0m',
+                '  [32m✓ the does should have unique first name[0m',
+                'Validating ' + str(fp_2),
+                '[32m  ✓ All columns match schema[0m',
+                'All good!',
+                '',
+            ]))
 
         os.remove(fp_1)
         os.remove(fp_2)
+
+    def test_cached_results(self):
+        datadir = Path(mkdtemp())
+        fp = datadir / 'person.csv'
+        fp.write_text('first,age\njohn,23\njean,43\n')
+
+        def run(age_range, use_cache=True, **kwargs):
+            conf = Config(
+                datadir,
+                files={'person.csv': {'schema': 'person'}},
+                schemas={'person': {'columns': [
+                    {'name': 'age', 'range': age_range}
+                ]}},
+                cache={'results': True}, no_spinner=True, **kwargs)
+            buf = StringIO()
+            with redirect_stdout(buf):
+                code = conf.run(use_cache=use_cache)
+            return code, buf.getvalue().split('\n')[1]
+
+        self.assertEqual(
+            run([0, 100]), (0, '\x1b[32m  ✓ All columns match schema\x1b[0m'))
+        self.assertEqual(
+            run([0, 100]),
+            (0, '\x1b[32m  ✓ Unchanged since last successful run\x1b[0m'))
+        self.assertEqual(
+            run([0, 100], use_cache=False),
+            (0, '\x1b[32m  ✓ All columns match schema\x1b[0m'))
+        # results of other reading options or versions are not reused
+        self.assertEqual(
+            run([0, 100], chunksize=1),
+            (0, '\x1b[32m  ✓ All columns match schema\x1b[0m'))
+        with patch('datavalid.file.__version__', '0.0.0'):
+            self.assertEqual(
+                run([0, 100]),
+                (0, '\x1b[32m  ✓ All columns match schema\x1b[0m'))
+        self.assertEqual(
+            run([0, 30]), (1, '\x1b[31m  ✕ Does not match schema\x1b[0m'))
+
+        fp.write_text('first,age\njohn,23\n')
+        self.assertEqual(
+            run([0, 30]), (0, '\x1b[32m  ✓ All columns match schema\x1b[0m'))
+        self.assertEqual(
+            run([0, 30]),
+            (0, '\x1b[32m  ✓ Unchanged since last successful run\x1b[0m'))
+
+        shutil.rmtree(datadir)
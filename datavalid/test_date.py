@@ -2,12 +2,14 @@ import datetime
 
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 from pandas.testing import assert_frame_equal
 import time_machine
 
 from datavalid.date import DateParser, parse_single_date
 from datavalid.exceptions import BadConfigError, BadDateError
+from datavalid.frame_cache import FrameCache
 
 
 @time_machine.travel(datetime.datetime(2021, 8, 17))
@@ -92,6 +94,61 @@ class DateParserTestCase(TestCase):
             ['officer_join', 1900, 2, 29],
         ], columns=columns))
 
+    def test_parse_missing_components(self):
+        parser = DateParser(
+            year_column='year', month_column='month', day_column='day')
+        dates = parser.parse(pd.DataFrame({
+            'year': [2000, None, 2004, 2021],
+            'month': [2, 2, 2, None],
+            'day': [None, 30, 29, 31],
+        }))
+        self.assertEqual(dates.year.tolist(), [2000, pd.NA, 2004, 2021])
+        self.assertEqual(dates.date.tolist(), [
+            pd.NaT, pd.NaT, pd.Timestamp(2004, 2, 29), pd.NaT,
+        ])
+
+    def test_parse_cached(self):
+        columns = ['event', 'event_year', 'event_month', 'event_day']
+        df = pd.DataFrame([
+            ['officer_join', 2000, 13, 3],
+            ['promotion', 2001, 10, 2],
+            ['promotion', 2010, 9, 3],
+        ], columns=columns)
+        parser = DateParser(
+            year_column='event_year', month_column='event_month', day_column='event_day')
+        cache = FrameCache(df)
+
+        with self.assertRaises(BadDateError) as cm:
+            parser.parse(df, cache)
+        self.assertEqual(cm.exception.msg, 'impossible months detected')
+        assert_frame_equal(cm.exception.rows, df.iloc[[0]])
+
+        # rows of a subset are taken from the dates parsed for the whole table
+        sub_df = df.iloc[[1, 2]].reset_index(drop=True)
+        assert_frame_equal(
+            parser.parse(sub_df, cache.subset(np.array([1, 2]))),
+            parser.parse(sub_df),
+        )
+
+    def test_parse_cached_bad_values_outside_subset(self):
+        df = pd.DataFrame([
+            ['event', '2000', '1', '1'],
+            ['event', '2000', '3', '5'],
+            ['other', 'unknown', '1', '1'],
+        ], columns=['kind', 'year', 'month', 'day'])
+        parser = DateParser(
+            year_column='year', month_column='month', day_column='day')
+        cache = FrameCache(df)
+
+        # the whole table can't be parsed but the first 2 rows can
+        sub_df = df.iloc[[0, 1]]
+        assert_frame_equal(
+            parser.parse(sub_df, cache.subset(np.array([0, 1]))),
+            parser.parse(sub_df),
+        )
+        with self.assertRaises(ValueError):
+            parser.parse(df, cache)
+
 
 class ParseSingleDateTestCase(TestCase):
     def test_parse_single_date(self):
@@ -1,15 +1,47 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
 from pandas.testing import assert_series_equal
 
 from datavalid.field_checkers import (
-    MatchRegexFieldChecker, TitleCaseFieldChecker, UniqueFieldChecker, NoNAFieldChecker, OptionsFieldChecker,
+    ColumnCache, MatchRegexFieldChecker, TitleCaseFieldChecker, UniqueFieldChecker, NoNAFieldChecker, OptionsFieldChecker,
     IntegerFieldChecker, FloatFieldChecker, RangeFieldChecker
 )
 
 
+class ColumnCacheTestCase(TestCase):
+    def test_by_unique(self):
+        column = ColumnCache(pd.Series(['b', None, 'a', 'b', np.NaN]))
+        codes, uniques = column.factorized
+        self.assertEqual(uniques.tolist(), ['b', 'a'])
+        self.assertEqual(
+            column.by_unique(uniques == 'b').tolist(),
+            [True, False, False, True, False],
+        )
+        self.assertEqual(
+            column.by_unique(np.ones(2, dtype=bool)).tolist(),
+            [True, False, True, True, False],
+        )
+
+    def test_match(self):
+        for values in [
+            ['ab1', 'Ab', '', 12, 'a\tb'],
+            ['ab1', 'Ab', 'é', 'b\n'],
+            ['a\x0bb', 'a\x1fb', 'a b'],
+        ]:
+            strings = pd.Series(values).astype(str)
+            for pattern in [r'[a-z]+\d', r'(?i)ab', r'(?<=a)b', r'\w$', r'x{,2}', r'^a\sb$']:
+                expected = strings.str.match(pattern).tolist()
+                self.assertEqual(
+                    ColumnCache(pd.Series(values)).match(pattern).tolist(), expected)
+                # results are the same without pyarrow
+                with patch('datavalid.field_checkers.pa', None):
+                    self.assertEqual(
+                        ColumnCache(pd.Series(values)).match(pattern).tolist(), expected)
+
+
 class UniqueFieldCheckerTestCase(TestCase):
     def test_check(self):
         c = UniqueFieldChecker()
@@ -20,6 +52,28 @@ class UniqueFieldCheckerTestCase(TestCase):
         )
 
 
+    def test_state(self):
+        c = UniqueFieldChecker()
+        state = c.new_state()
+        state.update(pd.Series([1, np.NaN, 2], name='a'))
+        self.assertIsNone(state.result())
+
+        other = c.new_state()
+        other.update(pd.Series([3, 3, np.NaN], name='a'))
+        state.merge(other)
+        assert_series_equal(
+            state.result(),
+            pd.Series([np.NaN, 3], name='a')
+        )
+
+    def test_state_mixed_dtypes(self):
+        c = UniqueFieldChecker()
+        state = c.new_state()
+        state.update(pd.Series([12, 13], name='id'))
+        state.update(pd.Series(['12', 'x'], name='id'))
+        assert_series_equal(state.result(), pd.Series([12], name='id'))
+
+
 class NoNAFieldCheckerTestCase(TestCase):
     def test_check(self):
         c = NoNAFieldChecker()
@@ -63,6 +117,16 @@ class IntegerFieldCheckerTestCase(TestCase):
             pd.Series(['a'], index=[1])
         )
 
+        assert_series_equal(
+            c.check(pd.Series(['3', '3.0', '1.00000000000000001', '9007199254740993.5'])),
+            pd.Series(['3.0', '1.00000000000000001', '9007199254740993.5'], index=[1, 2, 3])
+        )
+
+        assert_series_equal(
+            c.check(pd.Series([1, 1.0, 2.5, True, 'a b'])),
+            pd.Series([1.0, 2.5, True, 'a b'], index=[1, 2, 3, 4])
+        )
+
 
 class FloatFieldCheckerTestCase(TestCase):
     def test_check(self):
@@ -87,6 +151,19 @@ class RangeFieldCheckerTestCase(TestCase):
             pd.Series([20, 1899, 2021], index=[0, 1, 3])
         )
 
+        assert_series_equal(
+            c.check(pd.Series(['1950', '1899', '', np.NaN, '2020.5'])),
+            pd.Series(['1899', '2020.5'], index=[1, 4])
+        )
+
+    def test_state(self):
+        c = RangeFieldChecker(1900, 2020)
+        state = c.new_state()
+        state.update(pd.Series([20, 1970]))
+        assert_series_equal(state.result(), pd.Series([20]))
+        state.update(pd.Series(['a', 1970]))
+        assert_series_equal(state.result(), pd.Series(['a']))
+
 
 class TitleCaseFieldCheckerTestCase(TestCase):
     def test_check(self):
@@ -114,3 +191,10 @@ class MatchRegexFieldCheckerTestCase(TestCase):
             c.check(pd.Series(['', '1030', '15:03'])),
             pd.Series(['', '1030'])
         )
+
+        # values that compare equal are matched by their own string
+        c = MatchRegexFieldChecker(r'\d+$')
+        assert_series_equal(
+            c.check(pd.Series([1, 1.0, True, 2])),
+            pd.Series([1.0, True], index=[1, 2], dtype=object)
+        )
@@ -1,15 +1,18 @@
 import os
+import shutil
 import sys
-from unittest import TestCase
+from unittest import TestCase, skipIf
 from contextlib import redirect_stdout
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, mkdtemp
 from pathlib import Path
 from io import StringIO
 
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
+from datavalid.cache import Cache
 from datavalid.file import File
+from datavalid.reader import pa
 from datavalid.schema import Schema
 
 
@@ -113,6 +116,62 @@ class FileTestCase(TestCase):
 
         os.remove(fp)
 
+    def test_task_threads(self):
+        with NamedTemporaryFile(delete=False) as f:
+            pd.DataFrame([
+                ['john', 'doe', 23],
+                ['jean', 'smith', 43],
+                ['jane', 'smith', 30]
+            ], columns=['first', 'last', 'age']).to_csv(f, index=False)
+            fp = Path(f.name)
+        schema = Schema('person', validation_tasks=[
+            {
+                'name': 'last names are unique',
+                'unique': 'last'
+            },
+            {
+                'name': 'first names are unique',
+                'unique': 'first'
+            },
+            {
+                'name': 'no one is older than 40',
+                'empty': {'column': 'age', 'op': 'greater_than', 'value': 40},
+            },
+        ])
+
+        def validate(**kwargs):
+            file = File(fp.parent, str(fp), schema=schema, no_spinner=True, **kwargs)
+            buf = StringIO()
+            with redirect_stdout(buf):
+                self.assertFalse(file.valid())
+            return buf.getvalue()
+
+        first_failure = '\n'.join([
+            'Validating ' + str(fp),
+            '  \x1b[31m✕ last names are unique\x1b[0m',
+            '    Table contains duplicates',
+            '      first   last  age',
+            '    1  jean  smith   43',
+            '    2  jane  smith   30',
+            '',
+        ])
+        self.assertEqual(validate(), first_failure)
+        self.assertEqual(validate(task_threads=3), first_failure)
+        all_failures = first_failure + '\n'.join([
+            '  \x1b[32m✓ first names are unique\x1b[0m',
+            '  \x1b[31m✕ no one is older than 40\x1b[0m',
+            '    There are 1 such rows',
+            '      first   last  age',
+            '    1  jean  smith   43',
+            '',
+        ])
+        self.assertEqual(
+            validate(stop_on_first_failure=False), all_failures)
+        self.assertEqual(
+            validate(task_threads=2, stop_on_first_failure=False), all_failures)
+
+        os.remove(fp)
+
     def test_task_warn(self):
         with NamedTemporaryFile(delete=False) as f:
             pd.DataFrame([
@@ -144,8 +203,8 @@ class FileTestCase(TestCase):
             '  [33m⚠ the smiths should be younger than 30[0m',
             '    There are 2 such rows',
             '      first   last  age',
-            '    0  jean  smith   43',
-            '    1  jane  smith   30',
+            '    1  jean  smith   43',
+            '    2  jane  smith   30',
             '',
         ]))
 
@@ -215,3 +274,277 @@ class FileTestCase(TestCase):
             '      0    smith',
             '',
         ]))
+
+    def test_unparsable_numbers(self):
+        with NamedTemporaryFile(delete=False) as f:
+            pd.DataFrame([
+                ['john', 'doe', 23],
+                ['jean', 'smith', 43],
+                ['jane', 'smith', 'thirty']
+            ], columns=['first', 'last', 'age']).to_csv(f, index=False)
+            fp = Path(f.name)
+
+        file = File(fp.parent, str(fp), schema=Schema('person', columns=[
+            {'name': 'age', 'integer': True},
+            {'name': 'last', 'options': ['doe', 'smith']}
+        ]), no_spinner=True)
+
+        buf = StringIO()
+        with redirect_stdout(buf):
+            self.assertFalse(file.valid())
+            sys.stdout.flush()
+        self.assertEqual(buf.getvalue(), '\n'.join([
+            'Validating ' + str(fp),
+            '[31m  ✕ Does not match schema[0m',
+            '    [31m✕[0m column [33mage[0m failed [35minteger[0m check. [36m1[0m offending values:',
+            '      0    thirty',
+            '',
+        ]))
+
+        os.remove(fp)
+
+    def test_range_values(self):
+        with NamedTemporaryFile(delete=False) as f:
+            pd.DataFrame([
+                ['john', 23],
+                ['jean', 243],
+            ], columns=['first', 'age']).to_csv(f, index=False)
+            fp = Path(f.name)
+
+        file = File(fp.parent, str(fp), schema=Schema('person', columns=[
+            {'name': 'age', 'range': [0, 150]},
+        ]), no_spinner=True)
+
+        buf = StringIO()
+        with redirect_stdout(buf):
+            self.assertFalse(file.valid())
+            sys.stdout.flush()
+        # integers are printed as they were written
+        self.assertEqual(buf.getvalue().split('\n')[-2], '      0    243')
+
+        os.remove(fp)
+
+    def test_chunksize(self):
+        with NamedTemporaryFile(delete=False) as f:
+            pd.DataFrame([
+                ['john', 'doe', 23],
+                ['jean', 'smith', 43],
+                ['jane', 'smith', 30]
+            ], columns=['first', 'last', 'age']).to_csv(f, index=False)
+            fp = Path(f.name)
+
+        file = File(fp.parent, str(fp), schema=Schema('person', columns=[
+            {'name': 'age', 'integer': True},
+            {'name': 'last', 'unique': True}
+        ], validation_tasks=[
+            {
+                'name': 'the smiths should have unique first name',
+                'where': {'column': 'last', 'op': 'equal', 'value': 'smith'},
+                'unique': 'first'
+            }
+        ]), no_spinner=True, chunksize=2)
+
+        buf = StringIO()
+        with redirect_stdout(buf):
+            self.assertFalse(file.valid())
+            sys.stdout.flush()
+        self.assertEqual(buf.getvalue(), '\n'.join([
+            'Validating ' + str(fp),
+            '[31m  ✕ Does not match schema[0m',
+            '    [31m✕[0m column [33mlast[0m failed [35munique[0m check. [36m1[0m offending values:',
+            '      0    smith',
+            '  [32m✓ the smiths should have unique first name[0m',
+            '',
+        ]))
+
+        os.remove(fp)
+
+    def test_chunksize_mixed_types(self):
+        datadir = Path(mkdtemp())
+        (datadir / 'item.csv').write_text('id,code\n1.0,1\nabc,\n1.0,abc\n')
+        schema = Schema('item', columns=[
+            {'name': 'id', 'unique': True},
+            {'name': 'code', 'match_regex': r'^\w+$'},
+        ])
+
+        # chunks are read with the types inferred from the whole file
+        outputs = []
+        for chunksize in [None, 2]:
+            file = File(datadir, 'item.csv', schema=schema,
+                        no_spinner=True, chunksize=chunksize)
+            buf = StringIO()
+            with redirect_stdout(buf):
+                self.assertFalse(file.valid())
+                sys.stdout.flush()
+            outputs.append(buf.getvalue())
+        self.assertEqual(outputs[1], outputs[0])
+        self.assertEqual(outputs[0].split('\n')[2:4], [
+            '    \x1b[31m✕\x1b[0m column \x1b[33mid\x1b[0m failed \x1b[35munique\x1b[0m check. \x1b[36m1\x1b[0m offending values:',
+            '      0    1.0',
+        ])
+
+        shutil.rmtree(datadir)
+
+    def test_append_only(self):
+        datadir = Path(mkdtemp())
+        fp = datadir / 'event.csv'
+        fp.write_text('\n'.join([
+            'uid,kind,year,month,day',
+            '1,officer_join,2000,1,1',
+            '2,officer_join,2000,1,5',
+            '1,promotion,2000,5,1',
+        ])+'\n')
+        file = File(datadir, 'event.csv', schema=Schema('event', columns=[
+            {'name': 'uid', 'integer': True},
+            {'name': 'kind', 'options': ['officer_join', 'promotion']},
+        ], validation_tasks=[
+            {
+                'name': 'each officer joins once',
+                'where': {'column': 'kind', 'op': 'equal', 'value': 'officer_join'},
+                'unique': 'uid',
+            },
+            {
+                'name': 'no two promotions within 30 days',
+                'where': {'column': 'kind', 'op': 'equal', 'value': 'promotion'},
+                'group_by': 'uid',
+                'no_more_than_once_per_30_days': {'date_from': {
+                    'year_column': 'year', 'month_column': 'month', 'day_column': 'day'
+                }},
+            },
+        ]), no_spinner=True, cache=Cache(datadir), append_only=True)
+
+        def validate(*rows):
+            with fp.open('a') as f:
+                f.write(''.join(row+'\n' for row in rows))
+            buf = StringIO()
+            with redirect_stdout(buf):
+                succeed = file.valid()
+            return succeed, buf.getvalue().split('\n')[1]
+
+        full = '\x1b[32m  ✓ All columns match schema\x1b[0m'
+        self.assertEqual(validate(), (True, full))
+        self.assertEqual(validate(
+            '3,officer_join,2000,6,1',
+            '1,promotion,2000,7,1',
+        ), (True, '\x1b[32m  ✓ All 2 appended rows are valid\x1b[0m'))
+        self.assertEqual(validate(), (
+            True, '\x1b[32m  ✓ All 0 appended rows are valid\x1b[0m'))
+
+        # promotion too close to the one appended in the previous run
+        self.assertEqual(validate('1,promotion,2000,7,20'), (False, full))
+        fp.write_text('\n'.join(fp.read_text().split('\n')[:-2])+'\n')
+        self.assertEqual(validate(), (True, full))
+
+        # out of order dates and duplicated keys are caught
+        self.assertEqual(validate('2,promotion,2000,1,2'), (True, '\x1b[32m  ✓ All 1 appended rows are valid\x1b[0m'))
+        self.assertEqual(validate('2,promotion,1999,12,20'), (False, full))
+        fp.write_text('\n'.join(fp.read_text().split('\n')[:-2])+'\n')
+        self.assertEqual(validate(), (True, full))
+        self.assertEqual(validate('2,officer_join,2001,1,1'), (False, full))
+
+        # rows changed in place make a full run
+        fp.write_text(fp.read_text().replace('2,officer_join,2001', '4,officer_join,2001'))
+        self.assertEqual(validate(), (True, full))
+        fp.write_text(fp.read_text().replace('2000,1,1', '2000,1,2'))
+        self.assertEqual(validate(), (True, full))
+
+        shutil.rmtree(datadir)
+
+    def test_only_referenced_columns(self):
+        with NamedTemporaryFile(delete=False) as f:
+            pd.DataFrame([
+                ['john', 'doe', 23],
+                ['jean', 'smith', 43],
+                ['jane', 'smith', 30]
+            ], columns=['first', 'last', 'age']).to_csv(f, index=False)
+            fp = Path(f.name)
+
+        file = File(fp.parent, str(fp), schema=Schema('person', validation_tasks=[
+            {
+                'name': 'the smiths should be younger than 30',
+                'empty': {
+                    'and': [
+                        {'column': 'last', 'op': 'equal', 'value': 'smith'},
+                        {'column': 'age', 'op': 'greater_equal', 'value': 30},
+                    ],
+                },
+            }
+        ]), no_spinner=True, only_referenced_columns=True)
+
+        buf = StringIO()
+        with redirect_stdout(buf):
+            self.assertFalse(file.valid())
+            sys.stdout.flush()
+        self.assertEqual(buf.getvalue(), '\n'.join([
+            'Validating ' + str(fp),
+            '  [31m✕ the smiths should be younger than 30[0m',
+            '    There are 2 such rows',
+            '        last  age',
+            '    1  smith   43',
+            '    2  smith   30',
+            '',
+        ]))
+
+        os.remove(fp)
+
+    @skipIf(pa is None, 'pyarrow is not installed')
+    def test_engines_report_same_rows(self):
+        datadir = Path(mkdtemp())
+        (datadir / 'person.csv').write_text(
+            'first,last,age\n,smith,23\njean,smith,\njohn,doe,30\n')
+        schema = Schema('person', validation_tasks=[{
+            'name': 'last names should be unique',
+            'unique': 'last',
+        }])
+
+        outputs = []
+        for engine in ['pandas', 'pyarrow']:
+            file = File(datadir, 'person.csv', schema=schema,
+                        no_spinner=True, engine=engine)
+            buf = StringIO()
+            with redirect_stdout(buf):
+                self.assertFalse(file.valid())
+                sys.stdout.flush()
+            outputs.append(buf.getvalue())
+        self.assertEqual(outputs[1], outputs[0])
+        self.assertIn('NaN', outputs[0])
+
+        shutil.rmtree(datadir)
+
+    @skipIf(pa is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        with NamedTemporaryFile(delete=False, suffix='.parquet') as f:
+            fp = Path(f.name)
+        pd.DataFrame([
+            ['john', None, 23],
+            ['jean', 'smith', 43],
+            ['jane', 'smith', 30]
+        ], columns=['first', 'last', 'age']).to_parquet(fp, index=False)
+
+        file = File(fp.parent, str(fp), schema=Schema('person', columns=[
+            {'name': 'age', 'integer': True, 'range': [0, 150], 'no_na': True},
+            {'name': 'last', 'no_na': True}
+        ], validation_tasks=[
+            {
+                'name': 'the smiths should have unique first name',
+                'where': {'column': 'last', 'op': 'equal', 'value': 'smith'},
+                'unique': 'first'
+            }
+        ]), no_spinner=True)
+
+        buf = StringIO()
+        with redirect_stdout(buf):
+            self.assertFalse(file.valid())
+            sys.stdout.flush()
+        self.assertEqual(buf.getvalue(), '\n'.join([
+            'Validating ' + str(fp),
+            '\x1b[31m  ✕ Does not match schema\x1b[0m',
+            '    \x1b[31m✕\x1b[0m column \x1b[33mlast\x1b[0m failed \x1b[35mno_na\x1b[0m check. \x1b[36m1\x1b[0m offending values:',
+            '      0    None',
+            '  \x1b[32m✓ the smiths should have unique first name\x1b[0m',
+            '',
+        ]))
+        self.assertEqual(file._schema.referenced_columns(
+            file._reader.column_statistics(fp)), {'first', 'last'})
+
+        os.remove(fp)
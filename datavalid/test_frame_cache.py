@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from datavalid.frame_cache import FrameCache
+
+
+class FrameCacheTestCase(TestCase):
+    def test_get(self):
+        df = pd.DataFrame({'a': [1, 2, 3, 4]})
+        calls = []
+
+        def compute(df):
+            calls.append(df.shape[0])
+            return df.a.to_numpy() * 2
+
+        def take(value, positions):
+            return value if positions is None else value[positions]
+
+        cache = FrameCache(df)
+        self.assertEqual(cache.get('double', compute, take).tolist(), [2, 4, 6, 8])
+        sub = cache.subset(np.array([1, 3]))
+        self.assertEqual(sub.get('double', compute, take).tolist(), [4, 8])
+        self.assertEqual(
+            sub.subset(np.array([1])).get('double', compute, take).tolist(), [8])
+        self.assertEqual(calls, [4])
@@ -0,0 +1,48 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from datavalid.frame_cache import FrameCache
+from datavalid.keys import duplicated, factorize, key_hashes
+
+
+class KeysTestCase(TestCase):
+    def test_factorize(self):
+        codes, uniques = factorize(pd.Series([1, 1.0, True, '1', None, 1, 'a\0b', 'a\0c']))
+        self.assertEqual(codes.tolist(), [0, 1, 2, 3, -1, 0, 4, 5])
+        self.assertEqual(
+            [(type(v), v) for v in uniques],
+            [(int, 1), (float, 1.0), (bool, True), (str, '1'), (str, 'a\0b'), (str, 'a\0c')],
+        )
+
+    def test_duplicated(self):
+        df = pd.DataFrame({
+            'uid': ['a', 'b', 'a', None, None, 'c'],
+            'score': [0.0, 1.5, -0.0, np.nan, np.nan, 1.5],
+            'kind': pd.Series(['x', 'y', 'x', 'y', 'y', 'x'], dtype='category'),
+        })
+        for cols in [['uid'], ['score'], ['uid', 'score'], ['uid', 'kind'], ['score', 'kind']]:
+            self.assertEqual(
+                duplicated(df, cols).tolist(),
+                df.duplicated(cols, keep=False).tolist(),
+            )
+
+        # rows whose hashes collide are told apart by their values
+        with patch('datavalid.keys.column_hashes', lambda sr: np.zeros(sr.size, dtype='uint64')):
+            self.assertEqual(
+                duplicated(df, ['uid']).tolist(),
+                df.duplicated(['uid'], keep=False).tolist(),
+            )
+
+    def test_key_hashes_cached(self):
+        df = pd.DataFrame({'uid': ['a', 'b', 'a', 'c'], 'n': [1, 2, 1, 3]})
+        cache = FrameCache(df)
+        hashes = key_hashes(df, ['uid', 'n'], cache)
+        self.assertEqual(hashes.tolist(), key_hashes(df, ['uid', 'n']).tolist())
+        positions = np.array([1, 2])
+        self.assertEqual(
+            key_hashes(df.iloc[positions], ['uid', 'n'], cache.subset(positions)).tolist(),
+            hashes[positions].tolist(),
+        )
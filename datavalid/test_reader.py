@@ -0,0 +1,125 @@
+import os
+from unittest import TestCase, skipIf
+from tempfile import NamedTemporaryFile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from datavalid.exceptions import BadConfigError
+from datavalid.reader import (
+    ArrowReader, FeatherReader, PandasReader, ParquetReader, get_reader, pa
+)
+
+
+class GetReaderTestCase(TestCase):
+    def test_get_reader(self):
+        self.assertIsInstance(get_reader(), PandasReader)
+        self.assertIsInstance(get_reader('pandas'), PandasReader)
+        with self.assertRaises(BadConfigError) as cm:
+            get_reader('polars')
+        self.assertEqual(cm.exception.msg,
+                         'should be one of "pandas", "pyarrow"')
+
+
+@skipIf(pa is None, 'pyarrow is not installed')
+class ArrowReaderTestCase(TestCase):
+    def test_read(self):
+        with NamedTemporaryFile(delete=False, mode='w') as f:
+            f.write('\n'.join([
+                'uid,name,age,kind,joined',
+                '1,john,23,a,2020-01-02',
+                '2,,,b,2020-01-03',
+                '3,jane,30.0,a,',
+                '9007199254740993,joe,40,b,2020-01-04',
+            ])+'\n')
+            fp = Path(f.name)
+
+        self.assertIsInstance(get_reader('pyarrow'), ArrowReader)
+        for columns, dtype in [
+            (None, None),
+            ({'uid', 'kind', 'missing'}, {'kind': 'category'}),
+            (None, {'age': 'Int64', 'uid': 'float64', 'kind': 'category'}),
+            (None, {'age': 'Int64', 'uid': 'Int64'}),
+        ]:
+            assert_frame_equal(
+                ArrowReader().read(fp, columns, dtype),
+                PandasReader().read(fp, columns, dtype),
+            )
+
+        # missing text is NaN like with pandas, not None
+        self.assertIs(type(ArrowReader().read(fp).name[1]), float)
+
+        with self.assertRaises(ValueError):
+            ArrowReader().read(fp, dtype={'name': 'Int64'})
+
+        os.remove(fp)
+
+
+@skipIf(pa is None, 'pyarrow is not installed')
+class ColumnarReaderTestCase(TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame([
+            [1, 'john', 23.5, 'officer_join'],
+            [2, 'jean', np.NaN, 'officer_left'],
+            [3, None, 30.0, 'officer_left'],
+            [4, 'jane', 40.0, 'promotion'],
+        ], columns=['uid', 'name', 'age', 'kind'])
+
+    def test_parquet(self):
+        with NamedTemporaryFile(delete=False, suffix='.parquet') as f:
+            fp = Path(f.name)
+        self.df.to_parquet(fp, row_group_size=2, index=False)
+
+        reader = get_reader('pandas', fp)
+        self.assertIsInstance(reader, ParquetReader)
+        assert_frame_equal(reader.read(fp), self.df)
+        assert_frame_equal(
+            reader.read(fp, columns={'uid', 'kind', 'missing'}),
+            self.df[['uid', 'kind']]
+        )
+        assert_frame_equal(
+            reader.read(fp, filters=[
+                [('kind', '=', 'officer_left'), ('uid', '>', 2)],
+                [('kind', '=', 'promotion')],
+            ]),
+            self.df.iloc[2:].reset_index(drop=True)
+        )
+        assert_frame_equal(
+            reader.read(fp, filters=[[('kind', '=', 3)]]),
+            self.df
+        )
+        assert_frame_equal(
+            pd.concat(list(reader.read_chunks(fp, 3)), ignore_index=True),
+            self.df
+        )
+
+        stats = reader.column_statistics(fp)
+        self.assertEqual(
+            [(st.kind, st.min, st.max, st.null_count)
+             for st in stats.values()],
+            [
+                ('integer', 1, 4, 0),
+                ('other', None, None, 1),
+                ('float', 23.5, 40.0, 1),
+                ('other', None, None, 0),
+            ]
+        )
+
+        os.remove(fp)
+
+    def test_feather(self):
+        with NamedTemporaryFile(delete=False, suffix='.feather') as f:
+            fp = Path(f.name)
+        self.df.to_feather(fp)
+
+        reader = get_reader(None, fp)
+        self.assertIsInstance(reader, FeatherReader)
+        assert_frame_equal(reader.read(fp, columns={'name'}), self.df[['name']])
+        assert_frame_equal(
+            pd.concat(list(reader.read_chunks(fp, 3)), ignore_index=True),
+            self.df
+        )
+
+        os.remove(fp)
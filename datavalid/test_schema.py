@@ -31,6 +31,83 @@ class SchemaTestCase(TestCase):
         self.assertIsInstance(errs[1], ColumnMissingError)
         self.assertEqual(errs[1].column, 'gender')
 
+    def test_column_errors_from_chunks(self):
+        df = pd.DataFrame([
+            ['john', 'doe', 23, 'male'],
+            ['jean', 'smith', 43, np.NaN],
+            ['jane', 'smith', 30, 'female'],
+            ['paul', 'doe', 2030, 'other'],
+            ['mary', 'jones', 33, 'female'],
+        ], columns=['first', 'last', 'age', 'gender'])
+
+        schema = Schema('person', columns=[
+            {'name': 'first', 'unique': True, 'match_regex': r'^j'},
+            {'name': 'last', 'unique': True},
+            {'name': 'age', 'range': [0, 150]},
+            {'name': 'gender', 'options': ['male', 'female']},
+            {'name': 'race', 'no_na': True},
+        ])
+
+        expected = list(schema.column_errors(df))
+        self.assertEqual(len(expected), 5)
+        for size in [1, 2, 5]:
+            errs = list(schema.column_errors_from_chunks(
+                df.iloc[i:i+size] for i in range(0, df.shape[0], size)
+            ))
+            self.assertEqual(
+                [type(err) for err in errs], [type(err) for err in expected])
+            self.assertEqual(
+                [err.msg for err in errs], [err.msg for err in expected])
+
+    def test_referenced_columns(self):
+        schema = Schema('event', columns=[
+            {'name': 'event_uid', 'unique': True},
+        ], validation_tasks=[
+            {
+                'name': 'no officer with more than 1 left date in a calendar month',
+                'where': {'or': [
+                    {'column': 'kind', 'op': 'equal', 'value': 'officer_left'},
+                    {'column': 'agency', 'op': 'equal', 'value': 'nopd'},
+                ]},
+                'group_by': ['uid'],
+                'no_more_than_once_per_30_days': {'date_from': {
+                    'year_column': 'year', 'month_column': 'month', 'day_column': 'day'
+                }}
+            },
+            {
+                'name': 'unique per officer',
+                'unique': ['uid', 'event_uid'],
+            },
+        ])
+        self.assertEqual(schema.referenced_columns(), {
+            'event_uid', 'kind', 'agency', 'uid', 'year', 'month', 'day'
+        })
+
+    def test_to_filters(self):
+        tasks = [
+            {
+                'name': 'no officer with more than 1 left date in a calendar month',
+                'where': {'column': 'kind', 'op': 'equal', 'value': 'officer_left'},
+                'group_by': 'uid',
+                'unique': ['year', 'month'],
+            },
+            {
+                'name': 'no two joins on the same date',
+                'where': {'column': 'kind', 'op': 'equal', 'value': 'officer_join'},
+                'unique': ['uid', 'year', 'month', 'day'],
+            },
+        ]
+        self.assertEqual(Schema('event', validation_tasks=tasks).to_filters(), [
+            [('kind', '=', 'officer_left')],
+            [('kind', '=', 'officer_join')],
+        ])
+        self.assertIsNone(Schema('event', validation_tasks=tasks+[
+            {'name': 'unique events', 'unique': 'event_uid'},
+        ]).to_filters())
+        self.assertIsNone(Schema(
+            'event', columns=[{'name': 'kind'}], validation_tasks=tasks
+        ).to_filters())
+
     def test_rearrange_columns(self):
         schema = Schema(
             'person',
@@ -26,10 +26,8 @@ class TaskTestCase(TestCase):
             task.run(df)
         self.assertEqual(cm.exception.err_msg, 'There are 2 such rows')
         self.assertEqual(cm.exception.task_name, task.name)
-        assert_frame_equal(cm.exception.rows, pd.DataFrame([
-            ['jean', 'smith', 43],
-            ['jane', 'smith', 30]
-        ], columns=columns))
+        # rows keep their positions in the original table
+        assert_frame_equal(cm.exception.rows, df.iloc[[1, 2]])
 
         task = Task(
             'the smiths should have unique first name',
@@ -65,3 +63,74 @@ class TaskTestCase(TestCase):
             ['tate', 1960, 2, 28],
             ['cate', 1993, 11, 12],
         ], columns=['uid', 'year', 'month', 'day']))
+
+    def test_run_all_groups(self):
+        columns = ['uid', 'kind', 'year', 'month', 'day']
+        df = pd.DataFrame([
+            ['b', 'promotion', 2000, 1, 1],
+            ['a', 'promotion', 2000, 1, 1],
+            ['b', 'promotion', 2000, 1, 20],
+            ['a', 'promotion', 2000, 1, 10],
+            ['c', 'promotion', 2000, 1, 1],
+            ['b', 'promotion', 2000, 2, 5],
+        ], columns=columns)
+        task = Task(
+            'no two promotions within 30 days',
+            group_by='uid',
+            no_more_than_once_per_30_days={'date_from': {
+                'year_column': 'year', 'month_column': 'month', 'day_column': 'day'
+            }}
+        )
+        with self.assertRaises(TaskValidationError) as cm:
+            task.run(df)
+        self.assertEqual(
+            cm.exception.err_msg, '2 rows detected occur too close together')
+        assert_frame_equal(cm.exception.rows, df.iloc[[1, 3]])
+        self.assertIsNone(cm.exception.group_counts)
+
+        with self.assertRaises(TaskValidationError) as cm:
+            task.run(df, all_groups=True)
+        self.assertEqual(cm.exception.err_msg, '\n'.join([
+            '5 rows detected occur too close together',
+            '5 offending rows in 2 groups:',
+            'uid',
+            'a    2',
+            'b    3',
+        ]))
+        assert_frame_equal(cm.exception.rows, df.iloc[[1, 3, 0, 2, 5]])
+        self.assertEqual(cm.exception.group_counts.to_dict(), {'a': 2, 'b': 3})
+
+        with self.assertRaises(TaskValidationError) as cm:
+            task.run(df, all_groups=True, max_rows=1)
+        self.assertEqual(cm.exception.err_msg, '\n'.join([
+            '5 rows detected occur too close together',
+            '5 offending rows in 2 groups:',
+            'uid',
+            'a    2',
+            '... and 1 more groups',
+            'showing the first 1 offending rows',
+        ]))
+        assert_frame_equal(cm.exception.rows, df.iloc[[1]])
+
+        task = Task('unique kind per officer', group_by='uid', unique='kind')
+        with self.assertRaises(TaskValidationError) as cm:
+            task.run(df, all_groups=True)
+        assert_frame_equal(cm.exception.rows, df.iloc[[0, 1, 2, 3, 5]])
+
+    def test_run_filtered(self):
+        df = pd.DataFrame([
+            ['john', 'doe', 23, 'a'],
+            ['jean', 'smith', 43, 'b'],
+            ['jean', 'doe', 30, 'c'],
+            ['jean', 'smith', 30, 'd'],
+        ], columns=['first', 'last', 'age', 'note'])
+        task = Task(
+            'the smiths should have unique first name',
+            where={'column': 'last', 'op': 'equal', 'value': 'smith'},
+            unique='first'
+        )
+        with self.assertRaises(TaskValidationError) as cm:
+            task.run(df)
+        # whole rows are reported at their original positions even though
+        # the checker only reads `first`
+        assert_frame_equal(cm.exception.rows, df.iloc[[1, 3]])
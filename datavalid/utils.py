@@ -1,3 +1,5 @@
+import hashlib
+import json
 import os
 
 try:
@@ -9,3 +11,10 @@ except IndexError:
 def indent(s: str, n: int) -> str:
     spaces = ' '*n
     return spaces+s.replace('\n', '\n'+spaces)
+
+
+def hash_obj(obj) -> str:
+    """Returns a stable hash of a JSON-serializable object"""
+    return hashlib.sha1(
+        json.dumps(obj, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()